@@ -31,20 +31,38 @@ Last Updated: 2026-01-23
 # DEPENDENCIES
 # ==============================================================================
 
-from fastapi import FastAPI, HTTPException, UploadFile, File
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Tuple
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from typing import List, Optional, Dict, Tuple, FrozenSet, Set
 import os
+import re
 import json
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager, contextmanager
 from datetime import datetime
 import logging
 from enum import Enum
 import random
 import math
+import asyncio
+import functools
+import itertools
+import multiprocessing
 import httpx
 import base64
+import hashlib
+import sqlite3
+import tempfile
+import threading
+import unicodedata
+import warnings
 from io import BytesIO
+from multipart.multipart import MultipartParser, parse_options_header
 
 # Real API Libraries
 try:
@@ -55,7 +73,7 @@ except ImportError:
     print("⚠️  NumPy not installed - using standard library math")
 
 try:
-    from groq import Groq
+    from groq import AsyncGroq
     HAS_GROQ = True
 except ImportError:
     HAS_GROQ = False
@@ -69,38 +87,101 @@ except ImportError:
     print("⚠️  Google Vision API not installed - image detection limited")
 
 try:
-    import googlemaps
-    HAS_GOOGLE_MAPS = True
+    import h2  # noqa: F401 - enables HTTP/2 in httpx
+    HAS_HTTP2 = True
 except ImportError:
-    HAS_GOOGLE_MAPS = False
-    print("⚠️  Google Maps API not installed - location features limited")
+    HAS_HTTP2 = False
 
 try:
     from PIL import Image
-    from PIL.ExifTags import TAGS
     HAS_PIL = True
 except ImportError:
     HAS_PIL = False
     print("⚠️  Pillow not installed - EXIF detection limited")
 
+from image_processing import inspect_image, prepare_for_vision
+
 # ==============================================================================
 # REAL API CONFIGURATION
 # ==============================================================================
 
-# Google Maps API
+# Local stub server (stub_server.py) for offline load tests: when set,
+# Groq, Google Maps and Vision clients all talk to it instead
+API_STUB_URL = os.getenv("API_STUB_URL")
+if API_STUB_URL:
+    print(f"🧪 Using local API stub at {API_STUB_URL}")
+
+# Shared outbound HTTP client (created in the app lifespan): pooled
+# keep-alive connections, HTTP/2 where the h2 package is installed
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "10"))
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "true").lower() == "true" and HAS_HTTP2
+
+# Each call to an authority API gets AUTHORITY_TIMEOUT seconds; the outbox
+# workers send to several authorities concurrently
+AUTHORITY_TIMEOUT = float(os.getenv("AUTHORITY_TIMEOUT", "5"))
+
+# Durable notification outbox: requests only enqueue, background workers
+# deliver with exponential backoff (OUTBOX_BACKOFF_BASE * 2^n, capped)
+OUTBOX_DB_PATH = os.getenv("OUTBOX_DB_PATH", "./data/notification_outbox.db")
+OUTBOX_WORKERS = int(os.getenv("OUTBOX_WORKERS", "4"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "8"))
+OUTBOX_BACKOFF_BASE = float(os.getenv("OUTBOX_BACKOFF_BASE", "2"))
+OUTBOX_BACKOFF_MAX = float(os.getenv("OUTBOX_BACKOFF_MAX", "300"))
+# A claimed row is leased to its worker; if it is still in_flight after
+# OUTBOX_LEASE_SECONDS (the worker or its process died) any worker may reclaim it
+OUTBOX_LEASE_SECONDS = max(float(os.getenv("OUTBOX_LEASE_SECONDS", "60")), AUTHORITY_TIMEOUT * 2)
+OUTBOX_POLL_INTERVAL = 1.0
+
+# Geocoding results are cached in memory (LRU) over a SQLite table; reverse
+# lookups are keyed on coordinates rounded to GEOCODE_REVERSE_DECIMALS (~11 m)
+LOCATION_CACHE_DB_PATH = os.getenv("LOCATION_CACHE_DB_PATH", "./data/location_cache.db")
+LOCATION_CACHE_SIZE = int(os.getenv("LOCATION_CACHE_SIZE", "4096"))
+GEOCODE_CACHE_TTL = float(os.getenv("GEOCODE_CACHE_TTL", str(30 * 24 * 3600)))
+GEOCODE_NEGATIVE_TTL = float(os.getenv("GEOCODE_NEGATIVE_TTL", str(24 * 3600)))
+GEOCODE_REVERSE_DECIMALS = 4
+
+# Distance Matrix answers are cached per (mode, origin, destination) with
+# coordinates rounded to DISTANCE_QUANTIZE_DECIMALS (~110 m); each API call
+# covers at most 25 origins, 25 destinations and 100 elements
+DISTANCE_CACHE_TTL = float(os.getenv("DISTANCE_CACHE_TTL", str(7 * 24 * 3600)))
+DISTANCE_QUANTIZE_DECIMALS = 3
+DISTANCE_MATRIX_MAX_SIDE = 25
+DISTANCE_MATRIX_MAX_ELEMENTS = 100
+DISTANCE_MATRIX_MAX_POINTS = int(os.getenv("DISTANCE_MATRIX_MAX_POINTS", "100"))
+
+# Reports for the same (authority, incident type, ~500 m cell) within
+# NOTIFY_DEDUP_WINDOW seconds are rolled into one notification, and each
+# authority endpoint gets a token bucket of AUTHORITY_RATE_PER_MINUTE
+NOTIFY_DEDUP_WINDOW = float(os.getenv("NOTIFY_DEDUP_WINDOW", "600"))
+NOTIFY_CELL_DEGREES = float(os.getenv("NOTIFY_CELL_DEGREES", "0.005"))
+NOTIFY_ROLLUP_MAX_REPORTS = 20
+AUTHORITY_RATE_PER_MINUTE = float(os.getenv("AUTHORITY_RATE_PER_MINUTE", "30"))
+AUTHORITY_BURST = int(os.getenv("AUTHORITY_BURST", "10"))
+
+# Google Maps API (web service REST calls over the shared HTTP client)
 GOOGLE_MAPS_API_KEY = os.getenv("GOOGLE_MAPS_API_KEY")
-gmaps_client = None
-if HAS_GOOGLE_MAPS and GOOGLE_MAPS_API_KEY:
-    try:
-        gmaps_client = googlemaps.Client(key=GOOGLE_MAPS_API_KEY)
-        print("✅ Google Maps API initialized")
-    except Exception as e:
-        print(f"⚠️  Google Maps API error: {e}")
+GOOGLE_MAPS_BASE_URL = API_STUB_URL or "https://maps.googleapis.com"
+GOOGLE_MAPS_ENABLED = bool(GOOGLE_MAPS_API_KEY or API_STUB_URL)
+if GOOGLE_MAPS_API_KEY and not API_STUB_URL:
+    print("✅ Google Maps API initialized")
 
 # Google Vision API
 GOOGLE_VISION_ENABLED = os.getenv("GOOGLE_APPLICATION_CREDENTIALS") is not None
 vision_client = None
-if HAS_GOOGLE_VISION and GOOGLE_VISION_ENABLED:
+if HAS_GOOGLE_VISION and API_STUB_URL:
+    try:
+        from google.auth.credentials import AnonymousCredentials
+        vision_client = vision.ImageAnnotatorClient(
+            credentials=AnonymousCredentials(),
+            transport="rest",
+            client_options={"api_endpoint": API_STUB_URL}
+        )
+    except Exception as e:
+        print(f"⚠️  Google Vision stub error: {e}")
+elif HAS_GOOGLE_VISION and GOOGLE_VISION_ENABLED:
     try:
         vision_client = vision.ImageAnnotatorClient()
         print("✅ Google Vision API initialized")
@@ -108,15 +189,98 @@ if HAS_GOOGLE_VISION and GOOGLE_VISION_ENABLED:
         print(f"⚠️  Google Vision API error: {e}")
 
 # Groq API (Free LLM)
+# The async client keeps LLM calls off the event loop; the semaphore bounds
+# how many completions are in flight and every call gets its own deadline.
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
+GROQ_MODEL = os.getenv("GROQ_MODEL", "mixtral-8x7b-32768")
+GROQ_TIMEOUT = float(os.getenv("GROQ_TIMEOUT", "8"))
+GROQ_MAX_CONCURRENCY = int(os.getenv("GROQ_MAX_CONCURRENCY", "16"))
 groq_client = None
-if HAS_GROQ and GROQ_API_KEY:
+groq_semaphore = asyncio.Semaphore(GROQ_MAX_CONCURRENCY)
+if HAS_GROQ and (GROQ_API_KEY or API_STUB_URL):
     try:
-        groq_client = Groq(api_key=GROQ_API_KEY)
+        groq_client = AsyncGroq(
+            api_key=GROQ_API_KEY or "stub",
+            base_url=API_STUB_URL,
+            timeout=GROQ_TIMEOUT,
+            max_retries=0
+        )
         print("✅ Groq API initialized")
     except Exception as e:
         print(f"⚠️  Groq API error: {e}")
 
+# Identical concurrent analyses share one in-flight Groq call and the
+# result is memoized briefly, so incident storms cost one call per incident
+ANALYSIS_CACHE_TTL = float(os.getenv("ANALYSIS_CACHE_TTL", "120"))
+ANALYSIS_CACHE_SIZE = int(os.getenv("ANALYSIS_CACHE_SIZE", "2048"))
+
+# Optional micro-batching of Groq analyses into one prompt
+GROQ_MICROBATCH = os.getenv("GROQ_MICROBATCH", "false").lower() == "true"
+GROQ_BATCH_MAX_ITEMS = int(os.getenv("GROQ_BATCH_MAX_ITEMS", "8"))
+GROQ_BATCH_WINDOW_MS = float(os.getenv("GROQ_BATCH_WINDOW_MS", "25"))
+# A batch and its per-item fallback share one GROQ_TIMEOUT; the batched
+# call itself may use up to GROQ_BATCH_TIMEOUT of it
+GROQ_BATCH_TIMEOUT = float(os.getenv("GROQ_BATCH_TIMEOUT", str(GROQ_TIMEOUT * 0.6)))
+
+# Per-endpoint latency budgets: the rule engine answers immediately and
+# the LLM result is only used if it arrives within the budget (for
+# analyze_batch the budget covers the whole request, not each item)
+LATENCY_BUDGETS = {
+    'analyze': float(os.getenv("ANALYZE_LATENCY_BUDGET_MS", "1200")) / 1000,
+    'analyze_batch': float(os.getenv("BATCH_LATENCY_BUDGET_MS", "5000")) / 1000,
+}
+
+# Local severity/type classifier (train_severity_model.py); predictions at
+# or above LOCAL_MODEL_CONFIDENCE are used without asking the LLM
+USE_LOCAL_MODELS = os.getenv("USE_LOCAL_MODELS", "false").lower() == "true"
+MODEL_PATH = os.getenv("MODEL_PATH", "./models/")
+SEVERITY_MODEL_VERSION = 1
+SEVERITY_MODEL_PATH = os.getenv(
+    "SEVERITY_MODEL_PATH",
+    os.path.join(MODEL_PATH, f"severity_model.v{SEVERITY_MODEL_VERSION}.joblib")
+)
+LOCAL_MODEL_CONFIDENCE = float(os.getenv("LOCAL_MODEL_CONFIDENCE", "0.8"))
+
+# Batch analysis limits; batch LLM calls share one process-wide limit that
+# leaves at least half of GROQ_MAX_CONCURRENCY to /api/analyze
+BATCH_MAX_SIZE = int(os.getenv("BATCH_MAX_SIZE", "10000"))
+BATCH_LLM_CONCURRENCY = max(1, min(
+    int(os.getenv("BATCH_LLM_CONCURRENCY", "8")), GROQ_MAX_CONCURRENCY // 2
+))
+batch_llm_semaphore = asyncio.Semaphore(BATCH_LLM_CONCURRENCY)
+BATCH_STREAM_THRESHOLD = int(os.getenv("BATCH_STREAM_THRESHOLD", "100"))
+
+# Image uploads are streamed into a spooled buffer (memory up to
+# IMAGE_SPOOL_BYTES, then disk) and rejected as soon as a cap is exceeded
+IMAGE_MAX_BYTES = int(os.getenv("IMAGE_MAX_BYTES", str(10 * 1024 * 1024)))
+IMAGE_MAX_PIXELS = int(os.getenv("IMAGE_MAX_PIXELS", "40000000"))
+IMAGE_SPOOL_BYTES = int(os.getenv("IMAGE_SPOOL_BYTES", str(1024 * 1024)))
+IMAGE_SNIFF_BYTES = 256 * 1024
+
+# Image analyses are cached by SHA-256 of the bytes: an LRU in memory and
+# JSON files on disk, oldest evicted beyond IMAGE_CACHE_DISK_ENTRIES
+IMAGE_CACHE_SIZE = int(os.getenv("IMAGE_CACHE_SIZE", "512"))
+IMAGE_CACHE_DIR = os.getenv("IMAGE_CACHE_DIR", "./cache/images/")
+IMAGE_CACHE_DISK_ENTRIES = int(os.getenv("IMAGE_CACHE_DISK_ENTRIES", "10000"))
+IMAGE_CACHE_TTL = float(os.getenv("IMAGE_CACHE_TTL", str(7 * 24 * 3600)))
+
+# Near-duplicate photos by perceptual hash (Hamming distance out of 64 bits):
+# matches are reported, and close ones reuse the earlier Vision result
+IMAGE_DUPLICATE_DISTANCE = int(os.getenv("IMAGE_DUPLICATE_DISTANCE", "10"))
+IMAGE_REUSE_DISTANCE = int(os.getenv("IMAGE_REUSE_DISTANCE", "4"))
+
+# EXIF parsing, hashing and resizing run in a process pool so image uploads
+# do not block the event loop; 0 workers runs them in the thread pool instead
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", str(min(os.cpu_count() or 1, 4))))
+IMAGE_QUEUE_LIMIT = int(os.getenv("IMAGE_QUEUE_LIMIT", "32"))
+
+# Images sent to Vision are shrunk to VISION_MAX_SIDE px and re-encoded;
+# up to VISION_BATCH_LIMIT images go in one batch_annotate_images call
+VISION_MAX_SIDE = int(os.getenv("VISION_MAX_SIDE", "1024"))
+VISION_JPEG_QUALITY = int(os.getenv("VISION_JPEG_QUALITY", "85"))
+VISION_BATCH_LIMIT = 16
+IMAGE_MAX_FILES = int(os.getenv("IMAGE_MAX_FILES", "8"))
+
 # ==============================================================================
 # LOGGING
 # ==============================================================================
@@ -127,14 +291,206 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# ==============================================================================
+# CIRCUIT BREAKERS
+# ==============================================================================
+
+BREAKER_WINDOW_SECONDS = float(os.getenv("BREAKER_WINDOW_SECONDS", "30"))
+BREAKER_MIN_CALLS = int(os.getenv("BREAKER_MIN_CALLS", "10"))
+BREAKER_FAILURE_RATE = float(os.getenv("BREAKER_FAILURE_RATE", "0.5"))
+BREAKER_SLOW_CALL_SECONDS = float(os.getenv("BREAKER_SLOW_CALL_SECONDS", "5"))
+BREAKER_SLOW_CALL_RATE = float(os.getenv("BREAKER_SLOW_CALL_RATE", "0.8"))
+BREAKER_OPEN_SECONDS = float(os.getenv("BREAKER_OPEN_SECONDS", "20"))
+BREAKER_HALF_OPEN_PROBES = int(os.getenv("BREAKER_HALF_OPEN_PROBES", "2"))
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is short-circuited by an open breaker"""
+
+
+class CircuitBreaker:
+    """
+    Per-dependency circuit breaker with a rolling error-rate and
+    slow-call window.
+    
+    CLOSED -> OPEN when, over the last `window_seconds` (and at least
+    `min_calls` calls), the failure rate or slow-call rate is too high.
+    OPEN -> HALF_OPEN after `open_seconds`; up to `half_open_probes`
+    trial calls are let through and all must succeed to close again.
+    """
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(self, name: str):
+        self.name = name
+        self.window_seconds = BREAKER_WINDOW_SECONDS
+        self.min_calls = BREAKER_MIN_CALLS
+        self.failure_rate = BREAKER_FAILURE_RATE
+        self.slow_call_seconds = BREAKER_SLOW_CALL_SECONDS
+        self.slow_call_rate = BREAKER_SLOW_CALL_RATE
+        self.open_seconds = BREAKER_OPEN_SECONDS
+        self.half_open_probes = BREAKER_HALF_OPEN_PROBES
+        
+        self.state = self.CLOSED
+        self._calls: deque = deque()  # (timestamp, failed, slow)
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self.metrics = {'successes': 0, 'failures': 0, 'slow_calls': 0, 'rejected': 0, 'opened': 0}
+    
+    def is_open(self) -> bool:
+        """True while calls would be rejected (does not consume a probe)"""
+        return self.state == self.OPEN and time.monotonic() - self._opened_at < self.open_seconds
+    
+    def allow_request(self) -> bool:
+        """Decide whether a call may go out; half-open admits a few probes"""
+        if self.state == self.OPEN:
+            if time.monotonic() - self._opened_at < self.open_seconds:
+                self.metrics['rejected'] += 1
+                return False
+            self.state = self.HALF_OPEN
+            self._probes_in_flight = 0
+            self._probe_successes = 0
+            logger.info(f"Circuit {self.name}: half-open, probing")
+        
+        if self.state == self.HALF_OPEN:
+            if self._probes_in_flight >= self.half_open_probes:
+                self.metrics['rejected'] += 1
+                return False
+            self._probes_in_flight += 1
+        
+        return True
+    
+    def record(self, failed: bool, latency: float) -> None:
+        """Record the outcome of an admitted call"""
+        slow = latency >= self.slow_call_seconds
+        self.metrics['failures' if failed else 'successes'] += 1
+        if slow:
+            self.metrics['slow_calls'] += 1
+        
+        if self.state == self.HALF_OPEN:
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+            if failed or slow:
+                self._trip()
+            else:
+                self._probe_successes += 1
+                if self._probe_successes >= self.half_open_probes:
+                    self.state = self.CLOSED
+                    self._calls.clear()
+                    logger.info(f"Circuit {self.name}: closed")
+            return
+        
+        now = time.monotonic()
+        self._calls.append((now, failed, slow))
+        while self._calls and self._calls[0][0] < now - self.window_seconds:
+            self._calls.popleft()
+        
+        total = len(self._calls)
+        if self.state == self.CLOSED and total >= self.min_calls:
+            failures = sum(1 for _, f, _ in self._calls if f)
+            slow_calls = sum(1 for _, _, sl in self._calls if sl)
+            if failures / total >= self.failure_rate or slow_calls / total >= self.slow_call_rate:
+                self._trip()
+    
+    def _trip(self) -> None:
+        self.state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._calls.clear()
+        self.metrics['opened'] += 1
+        logger.warning(f"Circuit {self.name}: OPEN for {self.open_seconds}s - using fallbacks")
+    
+    @contextmanager
+    def track(self):
+        """Admit a call (or raise CircuitOpenError) and record its outcome"""
+        if not self.allow_request():
+            raise CircuitOpenError(self.name)
+        started = time.monotonic()
+        failed = None
+        try:
+            yield
+            failed = False
+        except Exception:
+            failed = True
+            raise
+        finally:
+            if failed is None:
+                # Cancelled: neither success nor failure, just free the probe
+                if self.state == self.HALF_OPEN:
+                    self._probes_in_flight = max(0, self._probes_in_flight - 1)
+            else:
+                self.record(failed, time.monotonic() - started)
+    
+    def snapshot(self) -> Dict:
+        """Breaker state and counters for monitoring"""
+        now = time.monotonic()
+        recent = [c for c in self._calls if c[0] >= now - self.window_seconds]
+        return {
+            'state': self.state,
+            'window_calls': len(recent),
+            'window_failure_rate': round(sum(1 for _, f, _ in recent if f) / len(recent), 3) if recent else 0.0,
+            **self.metrics
+        }
+
+
+circuit_breakers = {
+    'groq': CircuitBreaker('groq'),
+    'google_maps': CircuitBreaker('google_maps'),
+    'google_vision': CircuitBreaker('google_vision'),
+}
+
 # ==============================================================================
 # FastAPI APP
 # ==============================================================================
 
+http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Application-wide pooled HTTP client for outbound calls
+    
+    Created by the lifespan hook; also created on first use so helpers
+    work when the module is used outside the server.
+    """
+    global http_client
+    if http_client is None or http_client.is_closed:
+        http_client = httpx.AsyncClient(
+            http2=HTTP2_ENABLED,
+            timeout=HTTP_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+                keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+            ),
+            headers={'User-Agent': 'SafeRoute-AI/2.0'}
+        )
+    return http_client
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open shared clients on startup and release them on shutdown"""
+    get_http_client()
+    logger.info(f"HTTP client ready (HTTP/2: {HTTP2_ENABLED})")
+    get_notification_outbox().start(OUTBOX_WORKERS)
+    try:
+        yield
+    finally:
+        await get_notification_outbox().stop()
+        if _image_hash_index is not None:
+            await _image_hash_index.flush()
+        if http_client is not None:
+            await http_client.aclose()
+        image_workers.shutdown()
+
+
 app = FastAPI(
     title="SafeRoute AI Service (REAL APIS)",
     description="Production AI engine with real API integrations",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan
 )
 
 # CORS configuration
@@ -192,6 +548,21 @@ class IncidentAnalysisResponse(BaseModel):
     estimated_people: Optional[int]
     estimated_duration: Optional[str]
     authorities_to_notify: List[str]
+    analysis_source: str = "rules"  # llm | cache | model | rules
+
+
+class BatchAnalysisRequest(BaseModel):
+    """Batch incident analysis request"""
+    incidents: List[IncidentAnalysisRequest]
+    use_llm: bool = True
+
+
+class BatchScoreRequest(BaseModel):
+    """Rule-engine batch scoring request (parallel arrays)"""
+    types: List[str]
+    descriptions: List[str]
+    has_photos: Optional[List[bool]] = None
+    has_video: Optional[List[bool]] = None
 
 
 class RiskAssessmentRequest(BaseModel):
@@ -220,6 +591,13 @@ class EmergencyRequest(BaseModel):
     description: str
 
 
+class DistanceMatrixRequest(BaseModel):
+    """Distance matrix request (every origin to every destination)"""
+    origins: List[Dict]  # [{lat, lng}]
+    destinations: List[Dict]  # [{lat, lng}]
+    mode: str = 'driving'
+
+
 class AuthorityNotificationRequest(BaseModel):
     """Authority notification request"""
     incident_id: str
@@ -233,16 +611,43 @@ class AuthorityNotificationRequest(BaseModel):
 
 # Incident severity mapping
 SEVERITY_MAPPING = {
-    'construction': {'default': 'MEDIUM', 'keywords': ['blocking', 'emergency': 'HIGH']},
-    'traffic': {'default': 'LOW', 'keywords': ['jam': 'MEDIUM', 'accident': 'HIGH']},
-    'accident': {'default': 'HIGH', 'keywords': ['injured': 'CRITICAL', 'fatality': 'CRITICAL']},
-    'tree_fall': {'default': 'MEDIUM', 'keywords': ['power': 'CRITICAL', 'car': 'HIGH']},
-    'power_issue': {'default': 'HIGH', 'keywords': ['live': 'CRITICAL', 'widespread': 'HIGH']},
-    'violence': {'default': 'CRITICAL', 'keywords': ['weapon': 'CRITICAL', 'ongoing': 'CRITICAL']},
-    'flood': {'default': 'HIGH', 'keywords': ['rising': 'CRITICAL', 'evacuation': 'CRITICAL']},
-    'fire': {'default': 'CRITICAL', 'keywords': ['spreading': 'CRITICAL', 'residential': 'CRITICAL']}
+    'construction': {'default': 'MEDIUM', 'keywords': {'blocking': 'HIGH', 'emergency': 'HIGH'}},
+    'traffic': {'default': 'LOW', 'keywords': {'jam': 'MEDIUM', 'accident': 'HIGH'}},
+    'accident': {'default': 'HIGH', 'keywords': {'injured': 'CRITICAL', 'fatality': 'CRITICAL'}},
+    'tree_fall': {'default': 'MEDIUM', 'keywords': {'power': 'CRITICAL', 'car': 'HIGH'}},
+    'power_issue': {'default': 'HIGH', 'keywords': {'live': 'CRITICAL', 'widespread': 'HIGH'}},
+    'violence': {'default': 'CRITICAL', 'keywords': {'weapon': 'CRITICAL', 'ongoing': 'CRITICAL'}},
+    'flood': {'default': 'HIGH', 'keywords': {'rising': 'CRITICAL', 'evacuation': 'CRITICAL'}},
+    'fire': {'default': 'CRITICAL', 'keywords': {'spreading': 'CRITICAL', 'residential': 'CRITICAL'}}
 }
 
+SEVERITY_ORDER = ['LOW', 'MEDIUM', 'HIGH', 'CRITICAL']
+
+# Keyword rule tables
+DANGEROUS_WORDS = [
+    'accident', 'crash', 'collision', 'injured', 'dead', 'death',
+    'fire', 'burning', 'flames', 'explosion', 'bomb',
+    'violence', 'fight', 'shooting', 'stabbing', 'weapon',
+    'flood', 'drowning', 'water', 'submerged', 'evacuation',
+    'power', 'electric', 'wire', 'hazard', 'danger',
+    'critical', 'emergency', 'urgent', 'immediate', 'help',
+    'bleeding', 'unconscious', 'conscious', 'trapped'
+]
+
+# Any of these makes an incident CRITICAL regardless of type
+CRITICAL_KEYWORDS = ['death', 'dead', 'fatality', 'weapon', 'shooting', 'trapped', 'bleeding']
+
+# Any of these adds 10 points to the risk score
+RISK_KEYWORDS = ['death', 'dead', 'injured', 'bleeding', 'unconscious']
+
+# People-count hints, checked in priority order
+PEOPLE_HINTS = [
+    (('many', 'multiple', 'crowd'), 10),
+    (('two', 'couple', 'pair'), 2),
+    (('person', 'someone', 'individual'), 1),
+    (('group',), 5),
+]
+
 # Authority mapping with REAL India APIs
 AUTHORITY_MAPPING = {
     'construction': {
@@ -360,65 +765,105 @@ SAFETY_SUGGESTIONS = {
 # UTILITY FUNCTIONS
 # ==============================================================================
 
-def extract_keywords(text: str) -> List[str]:
+# Every word any rule looks for (also the column order for batch scoring)
+_RULE_WORDS = sorted(
+    set(DANGEROUS_WORDS) | set(CRITICAL_KEYWORDS) | set(RISK_KEYWORDS)
+    | {w for mapping in SEVERITY_MAPPING.values() for w in mapping['keywords']}
+    | {w for hint_words, _ in PEOPLE_HINTS for w in hint_words}
+)
+
+
+def _compile_rule_pattern() -> "re.Pattern":
+    """
+    One regex over every rule word (compiled once at import).
+    
+    The words are folded into a prefix trie so the regex engine does one
+    walk per position instead of trying each word in turn. Whole words
+    only, with an optional plural suffix, so 'power' matches 'powers' but
+    not 'powerful', and 'dead' does not match 'deadline'.
+    """
+    trie: Dict = {}
+    for word in _RULE_WORDS:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+    
+    def to_regex(node: Dict) -> str:
+        branches = [re.escape(ch) + to_regex(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return f'(?:{body})?' if '' in node else body
+    
+    return re.compile(rf"\b({to_regex(trie)})(?:s|es)?\b")
+
+
+RULE_PATTERN = _compile_rule_pattern()
+_SEVERITY_RANK = {level: rank for rank, level in enumerate(SEVERITY_ORDER)}
+_CRITICAL_SET = frozenset(CRITICAL_KEYWORDS)
+_RISK_SET = frozenset(RISK_KEYWORDS)
+
+
+@functools.lru_cache(maxsize=4096)
+def match_rule_words(text: str) -> FrozenSet[str]:
+    """
+    Scan text once and return every rule word it contains
+    
+    Args:
+        text: Input text
+        
+    Returns:
+        Set of matched rule words
+    """
+    return frozenset(m.group(1) for m in RULE_PATTERN.finditer(text.lower()))
+
+
+def extract_keywords(text: str, matched: Optional[FrozenSet[str]] = None) -> List[str]:
     """
     Extract keywords from text
     
     Args:
         text: Input text
+        matched: Precomputed match_rule_words(text)
         
     Returns:
         List of keywords
     """
-    keywords = []
-    dangerous_words = [
-        'accident', 'crash', 'collision', 'injured', 'dead', 'death',
-        'fire', 'burning', 'flames', 'explosion', 'bomb',
-        'violence', 'fight', 'shooting', 'stabbing', 'weapon',
-        'flood', 'drowning', 'water', 'submerged', 'evacuation',
-        'power', 'electric', 'wire', 'hazard', 'danger',
-        'critical', 'emergency', 'urgent', 'immediate', 'help',
-        'injured', 'bleeding', 'unconscious', 'conscious', 'trapped'
-    ]
-    
-    text_lower = text.lower()
-    for word in dangerous_words:
-        if word in text_lower:
-            keywords.append(word)
-    
-    return keywords
+    if matched is None:
+        matched = match_rule_words(text)
+    return [word for word in DANGEROUS_WORDS if word in matched]
 
 
-def calculate_severity(incident_type: str, description: str) -> str:
+def calculate_severity(
+    incident_type: str,
+    description: str,
+    matched: Optional[FrozenSet[str]] = None
+) -> str:
     """
     Calculate severity based on type and description
     
     Args:
         incident_type: Type of incident
         description: Description text
+        matched: Precomputed match_rule_words(description)
         
     Returns:
         Severity level
     """
-    # Get default severity for type
-    mapping = SEVERITY_MAPPING.get(incident_type.lower(), {})
-    severity = mapping.get('default', 'MEDIUM')
-    
-    # Check for severity keywords in description
-    keywords = mapping.get('keywords', {})
-    desc_lower = description.lower()
-    
-    for keyword, sev in keywords.items():
-        if keyword in desc_lower:
-            # Escalate if higher severity found
-            severity_order = ['LOW', 'MEDIUM', 'HIGH', 'CRITICAL']
-            if severity_order.index(sev) > severity_order.index(severity):
-                severity = sev
+    if matched is None:
+        matched = match_rule_words(description)
     
     # Check for critical keywords
-    critical_keywords = ['death', 'dead', 'fatality', 'weapon', 'shooting', 'trapped', 'bleeding']
-    if any(word in desc_lower for word in critical_keywords):
-        severity = 'CRITICAL'
+    if matched & _CRITICAL_SET:
+        return 'CRITICAL'
+    
+    # Get default severity for type, escalate on type-specific keywords
+    mapping = SEVERITY_MAPPING.get(incident_type.lower(), {})
+    severity = mapping.get('default', 'MEDIUM')
+    for keyword, sev in mapping.get('keywords', {}).items():
+        if keyword in matched and _SEVERITY_RANK[sev] > _SEVERITY_RANK[severity]:
+            severity = sev
     
     return severity
 
@@ -428,7 +873,8 @@ def calculate_risk_score(
     severity: str,
     description: str,
     has_photos: bool = False,
-    has_video: bool = False
+    has_video: bool = False,
+    matched: Optional[FrozenSet[str]] = None
 ) -> float:
     """
     Calculate risk score (0-100)
@@ -439,6 +885,7 @@ def calculate_risk_score(
         description: Description text
         has_photos: Has photos
         has_video: Has video
+        matched: Precomputed match_rule_words(description)
         
     Returns:
         Risk score 0-100
@@ -460,214 +907,667 @@ def calculate_risk_score(
         score += 10
     
     # Add points for keywords
-    critical_keywords = ['death', 'dead', 'injured', 'bleeding', 'unconscious']
-    if any(word in description.lower() for word in critical_keywords):
+    if matched is None:
+        matched = match_rule_words(description)
+    if matched & _RISK_SET:
         score = min(100, score + 10)
     
     # Cap at 100
     return min(100, score)
 
 
+def score_incidents_batch(
+    types: List[str],
+    descriptions: List[str],
+    has_photos: Optional[List[bool]] = None,
+    has_video: Optional[List[bool]] = None,
+    chunk_size: int = 100000
+) -> Dict[str, "np.ndarray"]:
+    """
+    Rule-engine severity and risk score for many incidents at once
+    
+    Each description is scanned once with RULE_PATTERN; matches become a
+    sparse (row, word) hit list, and severity escalation and risk scoring
+    are NumPy array operations over it.
+    Results equal calculate_severity / calculate_risk_score per item.
+    
+    Args:
+        types: Incident types
+        descriptions: Description texts
+        has_photos: Photo evidence flags (default all False)
+        has_video: Video evidence flags (default all False)
+        chunk_size: Descriptions per block (bounds peak memory)
+        
+    Returns:
+        {'severity': str array, 'risk_score': float array}
+    """
+    n = len(descriptions)
+    if len(types) != n:
+        raise ValueError("types and descriptions must have the same length")
+    for name, flags in (('has_photos', has_photos), ('has_video', has_video)):
+        if flags is not None and len(flags) != n:
+            raise ValueError(f"{name} and descriptions must have the same length")
+    
+    # Type -> default severity rank and per-word escalation rank (-1 = none)
+    type_names = list(SEVERITY_MAPPING)
+    type_index = {name: i for i, name in enumerate(type_names)}
+    word_index = {word: i for i, word in enumerate(_RULE_WORDS)}
+    default_rank = np.array(
+        [_SEVERITY_RANK[SEVERITY_MAPPING[t]['default']] for t in type_names] + [_SEVERITY_RANK['MEDIUM']],
+        dtype=np.int8
+    )
+    escalation = np.full((len(type_names) + 1, len(_RULE_WORDS)), -1, dtype=np.int8)
+    for t, mapping in SEVERITY_MAPPING.items():
+        for word, sev in mapping['keywords'].items():
+            escalation[type_index[t], word_index[word]] = _SEVERITY_RANK[sev]
+    is_critical = np.array([w in _CRITICAL_SET for w in _RULE_WORDS])
+    is_risk = np.array([w in _RISK_SET for w in _RULE_WORDS])
+    
+    type_ids = np.fromiter(
+        (type_index.get(t.lower(), len(type_names)) for t in types), dtype=np.int16, count=n
+    )
+    severity = default_rank[type_ids]
+    risk_hit = np.zeros(n, dtype=bool)
+    
+    for start in range(0, n, chunk_size):
+        chunk = descriptions[start:start + chunk_size]
+        hits = list(map(RULE_PATTERN.findall, map(str.lower, chunk)))
+        counts = np.fromiter(map(len, hits), dtype=np.int64, count=len(chunk))
+        total = int(counts.sum())
+        if not total:
+            continue
+        
+        # Sparse hit matrix in COO form: (row, word column) per match
+        rows = np.repeat(np.arange(start, start + len(chunk)), counts)
+        cols = np.fromiter(
+            map(word_index.__getitem__, itertools.chain.from_iterable(hits)),
+            dtype=np.int64, count=total
+        )
+        
+        np.maximum.at(severity, rows, escalation[type_ids[rows], cols])
+        severity[rows[is_critical[cols]]] = _SEVERITY_RANK['CRITICAL']
+        risk_hit[rows[is_risk[cols]]] = True
+    
+    base_scores = np.array([20, 50, 75, 95], dtype=np.float64)
+    risk = base_scores[severity]
+    if has_photos is not None:
+        risk += 5 * np.asarray(has_photos, dtype=bool)
+    if has_video is not None:
+        risk += 10 * np.asarray(has_video, dtype=bool)
+    risk = np.minimum(100, risk + 10 * risk_hit)
+    
+    return {
+        'severity': np.array(SEVERITY_ORDER)[severity],
+        'risk_score': risk,
+    }
+
+
 # ==============================================================================
-# REAL API FUNCTIONS - Google Maps, Vision, Groq
+# LOCAL TEXT CLASSIFIER
 # ==============================================================================
 
-async def get_geocoding(address: str) -> Optional[Dict]:
+_severity_model: Optional[Dict] = None
+_severity_model_loaded = False
+
+
+def severity_model_text(incident_type: str, description: str) -> str:
+    """Model input: the type as a token plus the description"""
+    return f"type_{incident_type.strip().lower()} {description}"
+
+
+def compile_text_classifier(pipeline):
     """
-    Get geocoding from address using Google Maps API
+    Turn a fitted HashingVectorizer -> TfidfTransformer -> linear classifier
+    pipeline into a plain function (text -> (label, probability)).
     
-    Args:
-        address: Address string
+    Same maths as pipeline.predict_proba, minus sklearn's per-call input
+    validation, which dominates the cost for a single short text.
+    """
+    from sklearn.utils import murmurhash3_32
+    
+    vectorizer, tfidf, classifier = [step for _, step in pipeline.steps]
+    analyze = vectorizer.build_analyzer()
+    n_features = vectorizer.n_features
+    idf = tfidf.idf_
+    coef = classifier.coef_
+    intercept = classifier.intercept_
+    classes = [str(c) for c in classifier.classes_]
+    
+    def predict(text: str) -> Tuple[str, float]:
+        counts: Dict[int, int] = {}
+        for token in analyze(text):
+            h = murmurhash3_32(token, seed=0)
+            index = (2147483647 - (n_features - 1)) % n_features if h == -2147483648 else abs(h) % n_features
+            counts[index] = counts.get(index, 0) + 1
         
+        indices = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+        weights = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+        if tfidf.sublinear_tf:
+            weights = 1 + np.log(weights)
+        weights *= idf[indices]
+        if tfidf.norm == 'l2' and weights.size:
+            weights /= np.sqrt((weights ** 2).sum())
+        
+        scores = coef[:, indices] @ weights + intercept
+        probabilities = 1 / (1 + np.exp(-scores))
+        if len(classes) == 2:
+            probabilities = np.array([1 - probabilities[0], probabilities[0]])
+        else:
+            probabilities /= probabilities.sum()
+        best = int(probabilities.argmax())
+        return classes[best], float(probabilities[best])
+    
+    return predict
+
+
+def load_severity_model() -> Optional[Dict]:
+    """
+    Load the versioned severity/type artifact once (lazily)
+    
     Returns:
-        Geocoding result with lat, lng
+        Artifact dict with 'severity' and 'type' pipelines, or None
     """
-    if not gmaps_client:
-        logger.warning("Google Maps API not available")
+    global _severity_model, _severity_model_loaded
+    if _severity_model_loaded:
+        return _severity_model
+    _severity_model_loaded = True
+    
+    if not USE_LOCAL_MODELS or not HAS_NUMPY:
         return None
     
     try:
-        result = gmaps_client.geocode(address)
-        if result:
-            location = result[0]['geometry']['location']
-            return {
-                'lat': location['lat'],
-                'lng': location['lng'],
-                'formatted_address': result[0]['formatted_address']
-            }
+        import joblib
+        artifact = joblib.load(SEVERITY_MODEL_PATH)
+        if artifact.get('version') != SEVERITY_MODEL_VERSION:
+            logger.warning(f"Severity model version {artifact.get('version')} != {SEVERITY_MODEL_VERSION} - ignoring")
+            return None
+        _severity_model = {
+            **artifact,
+            'predict_severity': compile_text_classifier(artifact['severity']),
+            'predict_type': compile_text_classifier(artifact['type']) if artifact.get('type') is not None else None,
+        }
+        logger.info(f"✅ Local severity model loaded ({artifact.get('trained_at')}, {artifact.get('samples')} samples)")
+    except FileNotFoundError:
+        logger.warning(f"No local severity model at {SEVERITY_MODEL_PATH}")
     except Exception as e:
-        logger.error(f"Geocoding error: {e}")
+        logger.error(f"Local severity model error: {e}")
     
-    return None
+    return _severity_model
 
 
-async def get_distance_matrix(
-    origin: Dict,
-    destination: Dict,
-    mode: str = 'driving'
-) -> Optional[Dict]:
+def classify_locally(incident_type: str, description: str) -> Optional[Dict]:
     """
-    Get distance and duration using Google Maps Distance Matrix API
+    Predict severity (and type) with the local linear model
     
     Args:
-        origin: Origin location {lat, lng}
-        destination: Destination location {lat, lng}
-        mode: Travel mode (driving, walking, transit)
+        incident_type: Reported incident type
+        description: Description text
         
     Returns:
-        Distance and duration info
+        {severity, severity_confidence, type, type_confidence} or None
     """
-    if not gmaps_client:
-        logger.warning("Google Maps API not available")
+    artifact = load_severity_model()
+    if not artifact:
         return None
     
-    try:
-        result = gmaps_client.distance_matrix(
-            origins=f"{origin['lat']},{origin['lng']}",
-            destinations=f"{destination['lat']},{destination['lng']}",
-            mode=mode
-        )
-        
-        if result['rows']:
-            element = result['rows'][0]['elements'][0]
-            if element['status'] == 'OK':
-                return {
-                    'distance_km': element['distance']['value'] / 1000,
-                    'duration_minutes': element['duration']['value'] / 60,
-                    'status': 'OK'
-                }
-    except Exception as e:
-        logger.error(f"Distance Matrix error: {e}")
+    result = {}
+    result['severity'], result['severity_confidence'] = artifact['predict_severity'](
+        severity_model_text(incident_type, description)
+    )
+    if artifact['predict_type']:
+        result['type'], result['type_confidence'] = artifact['predict_type'](description)
     
-    return None
+    return result
 
 
-async def analyze_image_with_vision(
-    image_data: bytes
-) -> Optional[Dict]:
+# ==============================================================================
+# REAL API FUNCTIONS - Google Maps, Vision, Groq
+# ==============================================================================
+
+class GoogleMapsError(Exception):
+    """Non-OK status from a Google Maps web service"""
+
+
+async def google_maps_request(service: str, params: Dict) -> Dict:
     """
-    Analyze image using Google Vision API
+    Call a Google Maps web service over the shared HTTP client
     
     Args:
-        image_data: Image bytes
+        service: Service name, e.g. 'geocode' or 'distancematrix'
+        params: Query parameters (the API key is added)
         
     Returns:
-        Vision analysis (objects, text, faces detected)
+        Parsed JSON response (status OK or ZERO_RESULTS)
     """
-    if not vision_client:
-        logger.warning("Google Vision API not available")
-        return None
-    
-    try:
-        image = vision.Image(content=image_data)
-        
-        # Detect objects
-        objects = vision_client.object_localization(image=image).localized_objects
-        
-        # Detect labels
-        labels = vision_client.label_detection(image=image).label_annotations
-        
-        # Detect text
-        text = vision_client.text_detection(image=image).text_annotations
-        
-        return {
-            'objects': [
-                {
-                    'name': obj.name,
-                    'confidence': obj.score,
-                    'location': obj.bounding_poly
-                }
-                for obj in objects[:10]
-            ],
-            'labels': [
-                {'label': label.description, 'confidence': label.score}
-                for label in labels[:5]
-            ],
-            'text_detected': len(text) > 0,
-            'raw_text': text[0].description if text else '',
-            'confidence_score': sum(l.score for l in labels) / len(labels) if labels else 0
-        }
-    except Exception as e:
-        logger.error(f"Vision API error: {e}")
-        return None
+    response = await get_http_client().get(
+        f"{GOOGLE_MAPS_BASE_URL}/maps/api/{service}/json",
+        params={**params, 'key': GOOGLE_MAPS_API_KEY or 'AIzaStubKey'}
+    )
+    response.raise_for_status()
+    data = response.json()
+    if data.get('status') not in ('OK', 'ZERO_RESULTS'):
+        raise GoogleMapsError(f"{data.get('status')}: {data.get('error_message', '')}")
+    return data
+
+
+def geocode_result(result: Dict) -> Dict:
+    """Convert one Geocoding API result into {lat, lng, formatted_address}"""
+    location = result['geometry']['location']
+    return {
+        'lat': location['lat'],
+        'lng': location['lng'],
+        'formatted_address': result['formatted_address']
+    }
 
 
-def verify_image_authenticity(image_data: bytes) -> Dict:
+async def fetch_geocoding(params: Dict) -> Tuple[bool, Optional[Dict]]:
     """
-    Verify image authenticity using EXIF and metadata
+    Call the Geocoding API once
     
     Args:
-        image_data: Image bytes
+        params: {'address': ...} or {'latlng': 'lat,lng'}
         
     Returns:
-        Authenticity check result
+        (answered, result): answered is False when the API was unavailable
+        or failed, so "not found" answers can be cached and errors cannot
     """
-    if not HAS_PIL:
-        return {'authentic': True, 'warning': 'PIL not available'}
+    if not GOOGLE_MAPS_ENABLED:
+        logger.warning("Google Maps API not available")
+        return False, None
+    
+    if circuit_breakers['google_maps'].is_open():
+        return False, None
     
     try:
-        image = Image.open(BytesIO(image_data))
-        exif_data = image._getexif()
-        
-        metadata = {}
-        if exif_data:
-            for tag_id, value in exif_data.items():
-                tag_name = TAGS.get(tag_id, tag_id)
-                metadata[tag_name] = str(value)
-        
-        # Check for manipulations (basic heuristics)
-        is_authentic = True
-        warnings = []
-        
-        # Check if image has basic camera metadata
-        if not metadata.get('DateTime'):
-            warnings.append('Missing timestamp metadata')
-        
-        # Check for excessive compression
-        if image.format == 'JPEG':
-            # Simple heuristic: if very small file, might be suspicious
-            pass
-        
-        return {
-            'authentic': is_authentic,
-            'has_metadata': bool(metadata),
-            'metadata_sample': dict(list(metadata.items())[:5]),
-            'warnings': warnings,
-            'format': image.format,
-            'size': image.size
-        }
+        with circuit_breakers['google_maps'].track():
+            results = (await google_maps_request('geocode', params))['results']
+        return True, geocode_result(results[0]) if results else None
+    except CircuitOpenError:
+        pass
     except Exception as e:
-        logger.error(f"Image verification error: {e}")
-        return {'authentic': False, 'error': str(e)}
+        logger.error(f"Geocoding error: {e}")
+    
+    return False, None
 
 
-async def analyze_with_groq(
-    description: str,
-    incident_type: str
-) -> Optional[Dict]:
+_geocode_inflight: Dict[Tuple[str, str], "asyncio.Task"] = {}
+
+
+async def _resolve_geocoding(kind: str, key: str, params: Dict) -> Optional[Dict]:
+    """Fetch a geocoding miss and store the answer in both directions"""
+    answered, result = await fetch_geocoding(params)
+    if answered:
+        cache = get_location_cache()
+        ttl = GEOCODE_CACHE_TTL if result else GEOCODE_NEGATIVE_TTL
+        await cache.put(kind, key, result, ttl)
+        if result:
+            if kind != 'geocode':
+                await cache.put('geocode', normalize_address(result['formatted_address']), result, ttl)
+            await cache.put('reverse', quantize_coordinates(result['lat'], result['lng']), result, ttl)
+    return result
+
+
+async def lookup_geocoding(kind: str, key: str, params: Dict) -> Tuple[Optional[Dict], str]:
     """
-    Analyze incident using Groq LLM (Real AI)
+    Cached geocoding lookup shared by forward and reverse geocoding
+    
+    Concurrent misses for the same key share one API call.
     
     Args:
-        description: Incident description
-        incident_type: Type of incident
+        kind: 'geocode' (normalized address key) or 'reverse' (coordinate cell)
+        key: Cache key
+        params: Geocoding API parameters used on a miss
         
     Returns:
-        AI analysis result
+        (result or None, source) where source is 'memory', 'disk' or 'api'
     """
-    if not groq_client:
-        logger.warning("Groq API not available - using rule-based analysis")
+    cache = get_location_cache()
+    started = time.perf_counter()
+    tier, result = await cache.get(kind, key)
+    if tier is None:
+        flight = (kind, key)
+        task = _geocode_inflight.get(flight)
+        if task is None:
+            task = asyncio.ensure_future(_resolve_geocoding(kind, key, params))
+            _geocode_inflight[flight] = task
+            task.add_done_callback(lambda _: _geocode_inflight.pop(flight, None))
+        tier, result = 'api', await asyncio.shield(task)
+    cache.record(kind, tier, time.perf_counter() - started)
+    return result, tier
+
+
+def distance_element(element: Dict) -> Optional[Dict]:
+    """Convert one Distance Matrix element (None unless status is OK)"""
+    if element.get('status') != 'OK':
+        return None
+    return {
+        'distance_km': element['distance']['value'] / 1000,
+        'duration_minutes': element['duration']['value'] / 60,
+        'status': 'OK'
+    }
+
+
+def distance_matrix_tiles(pairs: Set[Tuple[str, str]]) -> List[Tuple[List[str], List[str]]]:
+    """
+    Split (origin, destination) pairs into API-sized requests
+    
+    Tiles cover at most DISTANCE_MATRIX_MAX_SIDE origins/destinations and
+    DISTANCE_MATRIX_MAX_ELEMENTS elements; tiles without a wanted pair are
+    dropped and the rest trimmed to the rows and columns they need.
+    """
+    origins = sorted({origin for origin, _ in pairs})
+    destinations = sorted({destination for _, destination in pairs})
+    columns = min(len(destinations), DISTANCE_MATRIX_MAX_SIDE)
+    rows = max(1, min(DISTANCE_MATRIX_MAX_SIDE, DISTANCE_MATRIX_MAX_ELEMENTS // columns))
+    
+    tiles = []
+    for i in range(0, len(origins), rows):
+        for j in range(0, len(destinations), columns):
+            tile_destinations = destinations[j:j + columns]
+            tile_origins = [
+                o for o in origins[i:i + rows]
+                if any((o, d) in pairs for d in tile_destinations)
+            ]
+            tile_destinations = [
+                d for d in tile_destinations
+                if any((o, d) in pairs for o in tile_origins)
+            ]
+            if tile_origins:
+                tiles.append((tile_origins, tile_destinations))
+    return tiles
+
+
+async def fetch_distance_tile(
+    origins: List[str],
+    destinations: List[str],
+    mode: str
+) -> Optional[List[List[Dict]]]:
+    """One Distance Matrix call; rows of raw elements, or None if it failed"""
+    if circuit_breakers['google_maps'].is_open():
         return None
     
     try:
-        prompt = f"""
-        Analyze this incident and provide structured analysis:
-        
-        Incident Type: {incident_type}
-        Description: {description}
-        
-        Provide analysis in this JSON format:
-        {{
+        with circuit_breakers['google_maps'].track():
+            result = await google_maps_request('distancematrix', {
+                'origins': "|".join(origins),
+                'destinations': "|".join(destinations),
+                'mode': mode
+            })
+        return [row['elements'] for row in result['rows']]
+    except CircuitOpenError:
+        pass
+    except Exception as e:
+        logger.error(f"Distance Matrix error: {e}")
+    
+    return None
+
+
+async def get_distance_matrices(
+    origins: List[Dict],
+    destinations: List[Dict],
+    mode: str = 'driving'
+) -> Tuple[List[List[Optional[Dict]]], Dict]:
+    """
+    Distance and duration from every origin to every destination
+    
+    Coordinates are rounded to ~110 m cells and each cell pair is cached,
+    so only uncached pairs reach the API, packed into as few Distance
+    Matrix calls as its element limits allow.
+    
+    Args:
+        origins: Origin locations [{lat, lng}]
+        destinations: Destination locations [{lat, lng}]
+        mode: Travel mode (driving, walking, transit)
+        
+    Returns:
+        (matrix, stats): matrix[i][j] is the distance info from origin i to
+        destination j (None if unknown); stats counts cached and fetched
+        elements and API calls
+    """
+    origin_cells = [
+        quantize_coordinates(p['lat'], p['lng'], DISTANCE_QUANTIZE_DECIMALS) for p in origins
+    ]
+    destination_cells = [
+        quantize_coordinates(p['lat'], p['lng'], DISTANCE_QUANTIZE_DECIMALS) for p in destinations
+    ]
+    pairs = {(o, d) for o in origin_cells for d in destination_cells}
+    keys = {pair: f"{mode}|{pair[0]}|{pair[1]}" for pair in pairs}
+    
+    cache = get_location_cache()
+    started = time.perf_counter()
+    cached = await cache.get_many('distance', list(keys.values()))
+    elapsed = time.perf_counter() - started
+    answers = {pair: cached[key][1] for pair, key in keys.items() if key in cached}
+    # The lookup time is recorded once; in a mixed batch it is charged to
+    # the disk reads, which is where it went
+    disk_hits = sum(1 for tier, _ in cached.values() if tier == 'disk')
+    memory_hits = len(cached) - disk_hits
+    if disk_hits:
+        cache.record('distance', 'disk', elapsed, disk_hits)
+    if memory_hits:
+        cache.record('distance', 'memory', 0.0 if disk_hits else elapsed, memory_hits)
+    
+    missing = pairs - answers.keys()
+    tiles, fetched = [], 0
+    if missing and not GOOGLE_MAPS_ENABLED:
+        logger.warning("Google Maps API not available")
+    elif missing:
+        tiles = distance_matrix_tiles(missing)
+        started = time.perf_counter()
+        results = await asyncio.gather(*(
+            fetch_distance_tile(tile_origins, tile_destinations, mode)
+            for tile_origins, tile_destinations in tiles
+        ))
+        elapsed = time.perf_counter() - started
+        
+        found, not_found = {}, {}
+        for (tile_origins, tile_destinations), rows in zip(tiles, results):
+            for origin, elements in zip(tile_origins, rows or []):
+                for destination, element in zip(tile_destinations, elements):
+                    pair = (origin, destination)
+                    if element.get('status') == 'OK':
+                        found[keys[pair]] = answers[pair] = distance_element(element)
+                    elif element.get('status') in ('NOT_FOUND', 'ZERO_RESULTS'):
+                        not_found[keys[pair]] = answers[pair] = None
+        
+        fetched = len(found) + len(not_found)
+        if fetched:
+            cache.record('distance', 'api', elapsed, fetched)
+        await cache.put_many('distance', found, DISTANCE_CACHE_TTL)
+        await cache.put_many('distance', not_found, GEOCODE_NEGATIVE_TTL)
+    
+    matrix = [[answers.get((o, d)) for d in destination_cells] for o in origin_cells]
+    stats = {
+        'cached_elements': len(pairs) - len(missing),
+        'fetched_elements': fetched,
+        'api_calls': len(tiles),
+    }
+    return matrix, stats
+
+
+async def get_distance_matrix(
+    origin: Dict,
+    destination: Dict,
+    mode: str = 'driving'
+) -> Optional[Dict]:
+    """
+    Get distance and duration using Google Maps Distance Matrix API
+    
+    Args:
+        origin: Origin location {lat, lng}
+        destination: Destination location {lat, lng}
+        mode: Travel mode (driving, walking, transit)
+        
+    Returns:
+        Distance and duration info
+    """
+    matrix, _ = await get_distance_matrices([origin], [destination], mode)
+    return matrix[0][0]
+
+
+def vision_response_to_analysis(response) -> Optional[Dict]:
+    """Convert one AnnotateImageResponse into the service's analysis dict"""
+    if response.error.message:
+        logger.error(f"Vision API image error: {response.error.message}")
+        return None
+    
+    objects = response.localized_object_annotations
+    labels = response.label_annotations
+    text = response.text_annotations
+    return {
+        'objects': [
+            {
+                'name': obj.name,
+                'confidence': obj.score,
+                'location': [
+                    {'x': v.x, 'y': v.y} for v in obj.bounding_poly.normalized_vertices
+                ]
+            }
+            for obj in objects[:10]
+        ],
+        'labels': [
+            {'label': label.description, 'confidence': label.score}
+            for label in labels[:5]
+        ],
+        'text_detected': len(text) > 0,
+        'raw_text': text[0].description if text else '',
+        'confidence_score': sum(l.score for l in labels) / len(labels) if labels else 0
+    }
+
+
+async def shrink_for_vision(image_data: bytes) -> bytes:
+    """Downscale an image for Vision in the worker pool (original if busy)"""
+    try:
+        return await image_workers.run(
+            prepare_for_vision, image_data, VISION_MAX_SIDE, VISION_JPEG_QUALITY
+        )
+    except ImageWorkersBusy:
+        return image_data
+
+
+async def analyze_images_with_vision(
+    images: List[bytes]
+) -> List[Optional[Dict]]:
+    """
+    Analyze images using one batched Google Vision request
+    
+    Objects, labels and text are requested together for every image, and
+    images are downscaled first, so N photos cost one round-trip (per
+    VISION_BATCH_LIMIT images) instead of 3N full-resolution ones.
+    
+    Args:
+        images: Image bytes, e.g. all photos of one incident
+        
+    Returns:
+        Vision analysis per image (None where it failed)
+    """
+    if not vision_client:
+        logger.warning("Google Vision API not available")
+        return [None] * len(images)
+    
+    if circuit_breakers['google_vision'].is_open():
+        return [None] * len(images)
+    
+    try:
+        contents = await asyncio.gather(*(shrink_for_vision(data) for data in images))
+        features = [
+            vision.Feature(type_=vision.Feature.Type.OBJECT_LOCALIZATION, max_results=10),
+            vision.Feature(type_=vision.Feature.Type.LABEL_DETECTION, max_results=10),
+            vision.Feature(type_=vision.Feature.Type.TEXT_DETECTION),
+        ]
+        requests = [
+            vision.AnnotateImageRequest(image=vision.Image(content=content), features=features)
+            for content in contents
+        ]
+        
+        loop = asyncio.get_running_loop()
+        responses = []
+        with circuit_breakers['google_vision'].track():
+            for start in range(0, len(requests), VISION_BATCH_LIMIT):
+                batch = await loop.run_in_executor(None, functools.partial(
+                    vision_client.batch_annotate_images,
+                    requests=requests[start:start + VISION_BATCH_LIMIT]
+                ))
+                responses.extend(batch.responses)
+        
+        return [vision_response_to_analysis(response) for response in responses]
+    except CircuitOpenError:
+        return [None] * len(images)
+    except Exception as e:
+        logger.error(f"Vision API error: {e}")
+        return [None] * len(images)
+
+
+async def groq_chat_completion(
+    prompt: str,
+    max_tokens: int = 500,
+    timeout: float = GROQ_TIMEOUT
+) -> str:
+    """
+    Run one Groq chat completion with bounded concurrency and a deadline
+    
+    The deadline covers waiting for a concurrency slot as well as the
+    call itself; only time spent in the call counts against the breaker.
+    
+    Args:
+        prompt: User prompt
+        max_tokens: Completion token limit
+        timeout: Seconds from now until the completion must be back
+        
+    Returns:
+        Completion text (raises on timeout, API error or open circuit)
+    """
+    deadline = time.monotonic() + timeout
+    await asyncio.wait_for(groq_semaphore.acquire(), timeout=timeout)
+    try:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise asyncio.TimeoutError()
+        with circuit_breakers['groq'].track():
+            message = await asyncio.wait_for(
+                groq_client.chat.completions.create(
+                    messages=[{"role": "user", "content": prompt}],
+                    model=GROQ_MODEL,
+                    temperature=0.1,
+                    max_tokens=max_tokens
+                ),
+                timeout=remaining
+            )
+    finally:
+        groq_semaphore.release()
+    
+    return message.choices[0].message.content
+
+
+async def analyze_with_groq(
+    description: str,
+    incident_type: str,
+    timeout: float = GROQ_TIMEOUT
+) -> Optional[Dict]:
+    """
+    Analyze incident using Groq LLM (Real AI)
+    
+    Args:
+        description: Incident description
+        incident_type: Type of incident
+        timeout: Deadline for the Groq call in seconds
+        
+    Returns:
+        AI analysis result
+    """
+    if not groq_client:
+        logger.warning("Groq API not available - using rule-based analysis")
+        return None
+    
+    try:
+        prompt = f"""
+        Analyze this incident and provide structured analysis:
+        
+        Incident Type: {incident_type}
+        Description: {description}
+        
+        Provide analysis in this JSON format:
+        {{
             "severity": "LOW|MEDIUM|HIGH|CRITICAL",
             "confidence": 0.0-1.0,
             "key_risks": ["risk1", "risk2"],
@@ -679,17 +1579,9 @@ async def analyze_with_groq(
         Be precise and factual.
         """
         
-        message = groq_client.chat.completions.create(
-            messages=[{"role": "user", "content": prompt}],
-            model="mixtral-8x7b-32768",
-            temperature=0.1,
-            max_tokens=500
-        )
-        
-        response_text = message.content[0].text
+        response_text = await groq_chat_completion(prompt, max_tokens=500, timeout=timeout)
         
         # Parse JSON from response
-        import json
         try:
             analysis = json.loads(response_text)
             logger.info(f"Groq analysis: {analysis}")
@@ -698,155 +1590,1574 @@ async def analyze_with_groq(
             logger.warning("Could not parse Groq response as JSON")
             return None
             
+    except asyncio.TimeoutError:
+        logger.warning(f"Groq API timed out after {timeout:.2f}s")
+        return None
+    except CircuitOpenError:
+        return None
     except Exception as e:
         logger.error(f"Groq API error: {e}")
         return None
 
 
-async def notify_india_authorities(
+class GroqMicroBatcher:
+    """
+    Collects analysis requests for up to `window_ms` or `max_items` and
+    sends them to Groq as one prompt that returns a JSON array.
+    
+    If the batched answer cannot be parsed (or has the wrong length),
+    every item falls back to its own analyze_with_groq call. The batch
+    and the fallback share one GROQ_TIMEOUT deadline, and any future left
+    unresolved (error, cancellation) is answered with None.
+    """
+    
+    def __init__(self, max_items: int, window_ms: float):
+        self.max_items = max_items
+        self.window = window_ms / 1000
+        self._pending: List[Tuple[str, str, "asyncio.Future"]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._runs: Set["asyncio.Task"] = set()
+    
+    async def submit(self, description: str, incident_type: str) -> Optional[Dict]:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((description, incident_type, future))
+        
+        if len(self._pending) >= self.max_items:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        
+        return await future
+    
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._run(batch))
+            self._runs.add(task)
+            task.add_done_callback(self._runs.discard)
+    
+    async def _run(self, batch: List[Tuple[str, str, "asyncio.Future"]]) -> None:
+        deadline = time.monotonic() + GROQ_TIMEOUT
+        try:
+            results: Optional[List[Optional[Dict]]] = None
+            
+            if len(batch) > 1:
+                results = await self._analyze_batch(
+                    [(d, t) for d, t, _ in batch], min(GROQ_BATCH_TIMEOUT, GROQ_TIMEOUT)
+                )
+            
+            remaining = deadline - time.monotonic()
+            if results is None and remaining > 0:
+                results = await asyncio.gather(
+                    *(analyze_with_groq(d, t, remaining) for d, t, _ in batch)
+                )
+            
+            for (_, _, future), result in zip(batch, results or []):
+                if not future.done():
+                    future.set_result(result)
+        except Exception as e:
+            logger.error(f"Groq batch run failed: {e}")
+        finally:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_result(None)
+    
+    async def _analyze_batch(self, items: List[Tuple[str, str]], timeout: float) -> Optional[List[Dict]]:
+        incidents = "\n".join(
+            f"{i + 1}. Incident Type: {t} | Description: {d}"
+            for i, (d, t) in enumerate(items)
+        )
+        prompt = f"""
+        Analyze each of these {len(items)} incidents independently:
+        
+        {incidents}
+        
+        Respond with ONLY a JSON array of {len(items)} objects, in the same order,
+        each in this format:
+        {{
+            "severity": "LOW|MEDIUM|HIGH|CRITICAL",
+            "confidence": 0.0-1.0,
+            "key_risks": ["risk1", "risk2"],
+            "suggested_actions": ["action1", "action2"],
+            "estimated_affected_people": number,
+            "authorities_needed": ["POLICE", "MEDICAL", etc]
+        }}
+        
+        Be precise and factual.
+        """
+        
+        try:
+            response_text = await groq_chat_completion(
+                prompt, max_tokens=min(8000, 400 * len(items)), timeout=timeout
+            )
+            analyses = json.loads(response_text[response_text.index('['):response_text.rindex(']') + 1])
+        except CircuitOpenError:
+            return None
+        except (ValueError, asyncio.TimeoutError) as e:
+            logger.warning(f"Groq batch of {len(items)} unusable ({e}) - falling back to per-item calls")
+            return None
+        except Exception as e:
+            logger.error(f"Groq batch API error: {e}")
+            return None
+        
+        if not isinstance(analyses, list) or len(analyses) != len(items) \
+                or not all(isinstance(a, dict) for a in analyses):
+            logger.warning(f"Groq batch returned {len(analyses) if isinstance(analyses, list) else 'non-list'} results for {len(items)} incidents - falling back")
+            return None
+        
+        logger.info(f"Groq batch analysis: {len(items)} incidents in one call")
+        return analyses
+
+
+groq_batcher = (
+    GroqMicroBatcher(GROQ_BATCH_MAX_ITEMS, GROQ_BATCH_WINDOW_MS)
+    if GROQ_MICROBATCH else None
+)
+
+
+def analysis_key(incident_type: str, description: str) -> Tuple[str, str]:
+    """
+    Normalize (type, description) so near-identical reports coalesce
+    
+    Args:
+        incident_type: Type of incident
+        description: Incident description
+        
+    Returns:
+        Normalized cache key
+    """
+    words = re.findall(r"[a-z0-9]+", description.lower())
+    return incident_type.strip().lower(), " ".join(words)
+
+
+_groq_inflight: Dict[Tuple[str, str], "asyncio.Task"] = {}
+_groq_results: "OrderedDict[Tuple[str, str], Tuple[float, Dict]]" = OrderedDict()
+
+
+def get_cached_analysis(key: Tuple[str, str]) -> Optional[Dict]:
+    """Return a memoized Groq analysis if it has not expired"""
+    entry = _groq_results.get(key)
+    if not entry:
+        return None
+    expires_at, analysis = entry
+    if expires_at < time.monotonic():
+        _groq_results.pop(key, None)
+        return None
+    _groq_results.move_to_end(key)
+    return analysis
+
+
+def store_cached_analysis(key: Tuple[str, str], analysis: Optional[Dict]) -> None:
+    """Memoize a Groq analysis (failures are not cached)"""
+    if not analysis:
+        return
+    _groq_results[key] = (time.monotonic() + ANALYSIS_CACHE_TTL, analysis)
+    _groq_results.move_to_end(key)
+    while len(_groq_results) > ANALYSIS_CACHE_SIZE:
+        _groq_results.popitem(last=False)
+
+
+def _finish_groq_flight(key: Tuple[str, str], task: "asyncio.Task") -> None:
+    _groq_inflight.pop(key, None)
+    if not task.cancelled() and task.exception() is None:
+        store_cached_analysis(key, task.result())
+
+
+async def analyze_with_groq_coalesced(
+    description: str,
+    incident_type: str
+) -> Optional[Dict]:
+    """
+    Single-flight wrapper around analyze_with_groq
+    
+    Concurrent callers with the same normalized key await the same task;
+    finished results are served from a short-lived memo.
+    
+    Args:
+        description: Incident description
+        incident_type: Type of incident
+        
+    Returns:
+        AI analysis result
+    """
+    key = analysis_key(incident_type, description)
+    
+    cached = get_cached_analysis(key)
+    if cached is not None:
+        return cached
+    
+    task = _groq_inflight.get(key)
+    if task is None:
+        if groq_batcher:
+            call = groq_batcher.submit(description, incident_type)
+        else:
+            call = analyze_with_groq(description, incident_type)
+        task = asyncio.ensure_future(call)
+        _groq_inflight[key] = task
+        task.add_done_callback(lambda t: _finish_groq_flight(key, t))
+    
+    # Shield so one caller disconnecting does not cancel the shared call
+    return await asyncio.shield(task)
+
+
+async def hedged_groq_analysis(
+    description: str,
+    incident_type: str,
+    budget: float
+) -> Tuple[Optional[Dict], str]:
+    """
+    Race the (coalesced) Groq analysis against a deadline
+    
+    A late answer is not lost: the shared task keeps running and its
+    result lands in the analysis cache for the next identical request.
+    
+    Args:
+        description: Incident description
+        incident_type: Type of incident
+        budget: Seconds to wait for the LLM
+        
+    Returns:
+        (analysis or None, source) where source is llm, cache or rules
+    """
+    cached = get_cached_analysis(analysis_key(incident_type, description))
+    if cached is not None:
+        return cached, 'cache'
+    
+    if budget <= 0 or circuit_breakers['groq'].is_open():
+        return None, 'rules'
+    
+    try:
+        analysis = await asyncio.wait_for(
+            analyze_with_groq_coalesced(description, incident_type),
+            timeout=budget
+        )
+    except asyncio.TimeoutError:
+        logger.info(f"Groq missed {budget:.2f}s budget - serving rule-based result")
+        return None, 'rules'
+    
+    return analysis, 'llm' if analysis else 'rules'
+
+
+def build_authority_payload(
     incident_type: str,
     severity: str,
     location: Dict,
     description: str
+) -> Dict:
+    """Notification body sent to authority APIs"""
+    return {
+        'incident_type': incident_type,
+        'severity': severity,
+        'location': location,
+        'description': description,
+        'timestamp': datetime.now().isoformat(),
+        'source': 'SafeRoute'
+    }
+
+
+class TokenBucket:
+    """Token bucket: `rate` tokens per second, holding at most `burst`"""
+    
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+    
+    def take(self) -> float:
+        """Take one token; returns 0 on success, else seconds until one is free"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+_authority_buckets: Dict[str, TokenBucket] = {}
+
+
+def authority_rate_limit(endpoint: str) -> float:
+    """Seconds to wait before the next call to this endpoint (0 = go ahead)"""
+    bucket = _authority_buckets.get(endpoint)
+    if bucket is None:
+        bucket = _authority_buckets[endpoint] = TokenBucket(
+            AUTHORITY_RATE_PER_MINUTE / 60, AUTHORITY_BURST
+        )
+    return bucket.take()
+
+
+async def send_authority_notification(
+    authority: str,
+    endpoint: str,
+    payload: Dict,
+    idempotency_key: Optional[str] = None
 ) -> Dict:
     """
-    Send notifications to real India government authorities
+    Post one notification to an authority API within AUTHORITY_TIMEOUT
+    
+    Args:
+        authority: Authority name (POLICE, FIRE, ...)
+        endpoint: Authority API URL
+        payload: Notification body
+        idempotency_key: Sent as Idempotency-Key so retries can be deduplicated
+        
+    Returns:
+        Delivery status for this authority ('rate_limited' with retry_after
+        when the endpoint's token bucket is empty)
+    """
+    wait = authority_rate_limit(endpoint)
+    if wait:
+        return {'status': 'rate_limited', 'retry_after': round(wait, 2)}
+    
+    headers = {
+        'Authorization': f'Bearer {os.getenv("AUTHORITY_API_TOKEN")}',
+        'Content-Type': 'application/json'
+    }
+    if idempotency_key:
+        headers['Idempotency-Key'] = idempotency_key
+    
+    try:
+        response = await asyncio.wait_for(
+            get_http_client().post(endpoint, json=payload, headers=headers),
+            timeout=AUTHORITY_TIMEOUT
+        )
+        
+        if response.status_code in [200, 201, 202]:
+            return {
+                'status': 'success',
+                'timestamp': datetime.now().isoformat()
+            }
+        return {
+            'status': 'failed',
+            'code': response.status_code
+        }
+    
+    except asyncio.TimeoutError:
+        logger.error(f"Authority notification to {authority} timed out after {AUTHORITY_TIMEOUT}s")
+        return {'status': 'timeout', 'error': f"No response within {AUTHORITY_TIMEOUT}s"}
+    except Exception as e:
+        logger.error(f"Authority notification error for {authority}: {e}")
+        return {
+            'status': 'error',
+            'error': str(e)
+        }
+
+
+DEFAULT_SUGGESTIONS = (
+    'Stay alert and aware',
+    'Report to authorities if needed'
+)
+CRITICAL_SUGGESTION = '🚨 CRITICAL: Take immediate action for safety'
+
+
+def _build_suggestion_table() -> Dict[Tuple[str, str], Tuple[str, ...]]:
+    """Frozen suggestion tuples for every (type, severity) pair"""
+    table = {}
+    for incident_type, suggestions in [*SAFETY_SUGGESTIONS.items(), ('', DEFAULT_SUGGESTIONS)]:
+        for severity in SEVERITY_ORDER:
+            prefix = (CRITICAL_SUGGESTION,) if severity == 'CRITICAL' else ()
+            table[(incident_type, severity)] = prefix + tuple(suggestions)
+    return table
+
+
+SUGGESTION_TABLE = _build_suggestion_table()
+
+
+def get_suggestions(incident_type: str, severity: str) -> Tuple[str, ...]:
+    """
+    Get safety suggestions (shared immutable tuple, never modify)
     
     Args:
         incident_type: Type of incident
         severity: Severity level
-        location: Location {lat, lng, address}
-        description: Description
         
     Returns:
-        Notification status for each authority
+        Tuple of suggestions
+    """
+    incident_type = incident_type.lower()
+    if incident_type not in SAFETY_SUGGESTIONS:
+        incident_type = ''
+    return SUGGESTION_TABLE.get(
+        (incident_type, severity),
+        SUGGESTION_TABLE[(incident_type, 'MEDIUM')]
+    )
+
+
+def estimate_people_count(
+    description: str,
+    matched: Optional[FrozenSet[str]] = None
+) -> Optional[int]:
     """
+    Estimate number of people involved
     
-    authority_config = AUTHORITY_MAPPING.get(incident_type.lower(), {})
-    authorities = authority_config.get('authorities', [])
-    endpoints = authority_config.get('api_endpoints', {})
+    Args:
+        description: Description text
+        matched: Precomputed match_rule_words(description)
+        
+    Returns:
+        Estimated count or None
+    """
+    if matched is None:
+        matched = match_rule_words(description)
     
-    notifications = {}
+    # Simple heuristics
+    for hint_words, count in PEOPLE_HINTS:
+        if any(word in matched for word in hint_words):
+            return count
     
-    for authority in authorities:
-        endpoint = endpoints.get(authority)
-        if not endpoint:
-            notifications[authority] = {'status': 'no_endpoint'}
-            continue
+    return None
+
+
+def estimate_duration(incident_type: str) -> Optional[str]:
+    """
+    Estimate incident duration
+    
+    Args:
+        incident_type: Type of incident
         
+    Returns:
+        Estimated duration string
+    """
+    durations = {
+        'construction': '2-8 hours',
+        'traffic': '30 minutes - 2 hours',
+        'accident': '1-4 hours',
+        'tree_fall': '2-6 hours',
+        'power_issue': '1-12 hours',
+        'violence': '15-60 minutes',
+        'flood': '6-72 hours',
+        'fire': '2-6 hours'
+    }
+    
+    return durations.get(incident_type.lower())
+
+
+# ==============================================================================
+# LOCATION CACHE
+# ==============================================================================
+
+def normalize_address(address: str) -> str:
+    """Cache key for an address: case, whitespace and punctuation insensitive"""
+    text = unicodedata.normalize('NFKC', address).casefold()
+    text = "".join(
+        " " if unicodedata.category(char)[0] in "PSZ" else char for char in text
+    )
+    return " ".join(text.split())
+
+
+def quantize_coordinates(lat: float, lng: float, decimals: int = GEOCODE_REVERSE_DECIMALS) -> str:
+    """Grid cell key for coordinates, e.g. '19.0760,72.8777'"""
+    return f"{float(lat):.{decimals}f},{float(lng):.{decimals}f}"
+
+
+class LocationCache:
+    """
+    Two-tier cache for Google Maps answers
+    
+    An in-memory LRU sits in front of a SQLite table keyed by (kind, key),
+    so results survive restarts and are shared by every worker process.
+    Kinds are 'geocode' (normalized address), 'reverse' (coordinate cell)
+    and 'distance' (mode and origin/destination cells). A cached None
+    means the API answered "not found".
+    
+    Lookup counts and latency per tier are kept for /api/health.
+    """
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS location_cache (
+            kind TEXT NOT NULL,
+            key TEXT NOT NULL,
+            value TEXT NOT NULL,
+            expires_at REAL NOT NULL,
+            PRIMARY KEY (kind, key)
+        ) WITHOUT ROWID;
+    """
+    
+    TIERS = ('memory', 'disk', 'api')
+    
+    def __init__(self, path: str, memory_size: int):
+        self.path = path
+        self.memory_size = memory_size
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript(self.SCHEMA)
+            self._db.execute("DELETE FROM location_cache WHERE expires_at < ?", (time.time(),))
+        self._memory: "OrderedDict[Tuple[str, str], Tuple[float, Optional[Dict]]]" = OrderedDict()
+        self._metrics: Dict[str, Dict[str, List[float]]] = {}
+    
+    # --- storage (runs in the default thread pool) ---
+    
+    def _load(self, kind: str, keys: List[str]) -> List[Tuple[str, float, str]]:
+        rows = []
+        with self._lock:
+            # Stay under SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                rows.extend(self._db.execute(
+                    f"""SELECT key, expires_at, value FROM location_cache
+                        WHERE kind = ? AND expires_at >= ?
+                        AND key IN ({",".join("?" * len(chunk))})""",
+                    (kind, time.time(), *chunk)
+                ).fetchall())
+        return rows
+    
+    def _save(self, rows: List[Tuple[str, str, str, float]]) -> None:
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO location_cache (kind, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                rows
+            )
+    
+    def _remember(self, kind: str, key: str, expires_at: float, value: Optional[Dict]) -> None:
+        self._memory[(kind, key)] = (expires_at, value)
+        self._memory.move_to_end((kind, key))
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+    
+    # --- async API ---
+    
+    async def get(self, kind: str, key: str) -> Tuple[Optional[str], Optional[Dict]]:
+        """
+        Look up a cached answer
+        
+        Returns:
+            (tier, value): tier is 'memory' or 'disk', or None on a miss
+        """
+        return (await self.get_many(kind, [key])).get(key, (None, None))
+    
+    async def get_many(self, kind: str, keys: List[str]) -> Dict[str, Tuple[str, Optional[Dict]]]:
+        """Look up many keys at once; returns {key: (tier, value)} for the hits"""
+        now = time.time()
+        found = {}
+        for key in keys:
+            entry = self._memory.get((kind, key))
+            if entry is None:
+                continue
+            if entry[0] >= now:
+                self._memory.move_to_end((kind, key))
+                found[key] = ('memory', entry[1])
+            else:
+                self._memory.pop((kind, key), None)
+        
+        misses = [key for key in keys if key not in found]
+        if misses:
+            loop = asyncio.get_running_loop()
+            for key, expires_at, value in await loop.run_in_executor(None, self._load, kind, misses):
+                found[key] = ('disk', json.loads(value))
+                self._remember(kind, key, expires_at, found[key][1])
+        return found
+    
+    async def put(self, kind: str, key: str, value: Optional[Dict], ttl: float) -> None:
+        """Store an answer in both tiers"""
+        await self.put_many(kind, {key: value}, ttl)
+    
+    async def put_many(self, kind: str, items: Dict[str, Optional[Dict]], ttl: float) -> None:
+        """Store {key: value} answers in both tiers"""
+        if not items:
+            return
+        expires_at = time.time() + ttl
+        for key, value in items.items():
+            self._remember(kind, key, expires_at, value)
+        rows = [(kind, key, json.dumps(value), expires_at) for key, value in items.items()]
+        loop = asyncio.get_running_loop()
         try:
-            # Prepare payload
-            payload = {
-                'incident_type': incident_type,
-                'severity': severity,
-                'location': location,
-                'description': description,
-                'timestamp': datetime.now().isoformat(),
-                'source': 'SafeRoute'
+            await loop.run_in_executor(None, self._save, rows)
+        except sqlite3.Error as e:
+            logger.warning(f"Location cache write failed: {e}")
+    
+    def record(self, kind: str, tier: str, seconds: float, count: int = 1) -> None:
+        """
+        Count lookups served by a tier in `seconds` of wall time
+        
+        A batch of `count` lookups records its time once, so the mean
+        latency per lookup is the batch time shared between its elements.
+        """
+        metrics = self._metrics.setdefault(kind, {t: [0, 0.0] for t in self.TIERS})
+        metrics[tier][0] += count
+        metrics[tier][1] += seconds
+    
+    def stats(self) -> Dict:
+        """Hit ratio and mean latency per kind and tier"""
+        stats = {'memory_entries': len(self._memory)}
+        for kind, metrics in self._metrics.items():
+            lookups = sum(count for count, _ in metrics.values())
+            hits = metrics['memory'][0] + metrics['disk'][0]
+            stats[kind] = {
+                'lookups': lookups,
+                'hit_ratio': round(hits / lookups, 4) if lookups else None,
+                **{f"{tier}_count": count for tier, (count, _) in metrics.items()},
+                **{
+                    f"{tier}_avg_ms": round(total / count * 1000, 3) if count else None
+                    for tier, (count, total) in metrics.items()
+                },
             }
-            
-            # Try to send to actual authority API
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.post(
-                    endpoint,
-                    json=payload,
-                    headers={
-                        'Authorization': f'Bearer {os.getenv("AUTHORITY_API_TOKEN")}',
-                        'Content-Type': 'application/json'
-                    }
+        return stats
+
+
+_location_cache: Optional[LocationCache] = None
+
+
+def get_location_cache() -> LocationCache:
+    """Location cache, opened on first use"""
+    global _location_cache
+    if _location_cache is None:
+        _location_cache = LocationCache(LOCATION_CACHE_DB_PATH, LOCATION_CACHE_SIZE)
+    return _location_cache
+
+
+# ==============================================================================
+# NOTIFICATION OUTBOX
+# ==============================================================================
+
+class NotificationOutbox:
+    """
+    Durable SQLite outbox for authority notifications
+    
+    Requests only insert rows (one per authority) and return; background
+    workers deliver them, retrying with exponential backoff. Each row has
+    an idempotency key (source id + authority): repeated requests for the
+    same incident are not enqueued twice, and the key is sent as the
+    Idempotency-Key header so retried deliveries can be deduplicated by
+    the receiving API. Claimed rows are leased for OUTBOX_LEASE_SECONDS;
+    rows left in flight by a crashed worker are reclaimed once it expires.
+    
+    Reports are clustered by (authority, incident type, map cell). Within
+    NOTIFY_DEDUP_WINDOW of a notification, later reports in its cluster are
+    folded into one pending roll-up, sent when the window ends (at once for
+    CRITICAL reports). outbox_reports links every report to the message
+    that carries it.
+    """
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS outbox (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            idempotency_key TEXT UNIQUE NOT NULL,
+            batch_id TEXT NOT NULL,
+            authority TEXT NOT NULL,
+            endpoint TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            status TEXT NOT NULL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            next_attempt_at REAL NOT NULL,
+            last_error TEXT,
+            created_at REAL NOT NULL,
+            updated_at REAL NOT NULL,
+            delivered_at REAL,
+            cluster_key TEXT
+        );
+        CREATE TABLE IF NOT EXISTS outbox_reports (
+            batch_id TEXT NOT NULL,
+            authority TEXT NOT NULL,
+            message_id INTEGER NOT NULL,
+            PRIMARY KEY (batch_id, authority)
+        );
+    """
+    
+    INDEXES = """
+        CREATE INDEX IF NOT EXISTS outbox_due ON outbox (status, next_attempt_at);
+        CREATE INDEX IF NOT EXISTS outbox_batch ON outbox (batch_id);
+        CREATE INDEX IF NOT EXISTS outbox_cluster ON outbox (cluster_key, created_at);
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript(self.SCHEMA)
+            columns = {row[1] for row in self._db.execute("PRAGMA table_info(outbox)")}
+            if 'cluster_key' not in columns:
+                self._db.execute("ALTER TABLE outbox ADD COLUMN cluster_key TEXT")
+                self._db.execute(
+                    """INSERT OR IGNORE INTO outbox_reports (batch_id, authority, message_id)
+                       SELECT batch_id, authority, id FROM outbox"""
                 )
-                
-                if response.status_code in [200, 201, 202]:
-                    notifications[authority] = {
-                        'status': 'success',
-                        'timestamp': datetime.now().isoformat()
-                    }
-                else:
-                    notifications[authority] = {
-                        'status': 'failed',
-                        'code': response.status_code
-                    }
-                    
-        except Exception as e:
-            logger.error(f"Authority notification error for {authority}: {e}")
-            notifications[authority] = {
-                'status': 'error',
-                'error': str(e)
+            self._db.executescript(self.INDEXES)
+        self._wakeup: Optional[asyncio.Event] = None
+        self._tasks: List["asyncio.Task"] = []
+    
+    # --- storage (runs in the default thread pool) ---
+    
+    def _insert(self, batch_id: str, messages: List[Tuple[str, str, str, Dict]]) -> None:
+        """Store (authority, endpoint, cluster_key, payload) reports, folding clusters"""
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                for authority, endpoint, cluster_key, payload in messages:
+                    if self._db.execute(
+                        "SELECT 1 FROM outbox_reports WHERE batch_id = ? AND authority = ?",
+                        (batch_id, authority)
+                    ).fetchone():
+                        continue
+                    message_id = self._fold(cluster_key, payload, now)
+                    if message_id is None:
+                        message_id = self._create(batch_id, authority, endpoint, cluster_key, payload, now)
+                    self._db.execute(
+                        "INSERT INTO outbox_reports (batch_id, authority, message_id) VALUES (?, ?, ?)",
+                        (batch_id, authority, message_id)
+                    )
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+    
+    def _fold(self, cluster_key: str, payload: Dict, now: float) -> Optional[int]:
+        """Add a report to its cluster's pending roll-up, if there is one"""
+        row = self._db.execute(
+            """SELECT id, payload FROM outbox
+               WHERE cluster_key = ? AND status = 'pending' AND created_at >= ?
+               ORDER BY id DESC LIMIT 1""",
+            (cluster_key, now - NOTIFY_DEDUP_WINDOW)
+        ).fetchone()
+        if row is None:
+            return None
+        
+        rolled = json.loads(row['payload'])
+        rolled['report_count'] = rolled.get('report_count', 1) + 1
+        if len(rolled.setdefault('reports', [])) < NOTIFY_ROLLUP_MAX_REPORTS:
+            rolled['reports'].append(payload['reports'][0])
+        severity = str(payload['severity']).upper()
+        if _SEVERITY_RANK.get(severity, -1) > _SEVERITY_RANK.get(str(rolled.get('severity')).upper(), -1):
+            rolled['severity'] = payload['severity']
+        
+        next_attempt_at = now if severity == 'CRITICAL' else None
+        self._db.execute(
+            """UPDATE outbox SET payload = ?, updated_at = ?,
+                   next_attempt_at = MIN(next_attempt_at, COALESCE(?, next_attempt_at))
+               WHERE id = ?""",
+            (json.dumps(rolled), now, next_attempt_at, row['id'])
+        )
+        return row['id']
+    
+    def _create(self, batch_id: str, authority: str, endpoint: str,
+                cluster_key: str, payload: Dict, now: float) -> int:
+        """New message; a roll-up delayed to the window end if the cluster was just notified"""
+        recent = self._db.execute(
+            """SELECT MAX(created_at) FROM outbox
+               WHERE cluster_key = ? AND created_at >= ?""",
+            (cluster_key, now - NOTIFY_DEDUP_WINDOW)
+        ).fetchone()[0]
+        
+        next_attempt_at = now
+        if recent is not None:
+            payload = {**payload, 'rollup': True}
+            if str(payload['severity']).upper() != 'CRITICAL':
+                next_attempt_at = recent + NOTIFY_DEDUP_WINDOW
+        
+        cursor = self._db.execute(
+            """INSERT INTO outbox
+               (idempotency_key, batch_id, authority, endpoint, payload, status,
+                next_attempt_at, created_at, updated_at, cluster_key)
+               VALUES (?, ?, ?, ?, ?, 'pending', ?, ?, ?, ?)""",
+            (f"{batch_id}:{authority}", batch_id, authority, endpoint,
+             json.dumps(payload), next_attempt_at, now, now, cluster_key)
+        )
+        return cursor.lastrowid
+    
+    def _claim(self, limit: int) -> List[sqlite3.Row]:
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._db.execute(
+                    """SELECT * FROM outbox
+                       WHERE (status = 'pending' AND next_attempt_at <= ?)
+                          OR (status = 'in_flight' AND updated_at <= ?)
+                       ORDER BY next_attempt_at LIMIT ?""",
+                    (now, now - OUTBOX_LEASE_SECONDS, limit)
+                ).fetchall()
+                self._db.executemany(
+                    "UPDATE outbox SET status = 'in_flight', updated_at = ? WHERE id = ?",
+                    [(now, row['id']) for row in rows]
+                )
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+        return rows
+    
+    def _update(self, message_id: int, status: str, attempts: int,
+                next_attempt_at: float, error: Optional[str]) -> None:
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                """UPDATE outbox SET status = ?, attempts = ?, next_attempt_at = ?,
+                       last_error = ?, updated_at = ?,
+                       delivered_at = CASE WHEN ? = 'delivered' THEN ? ELSE delivered_at END
+                   WHERE id = ?""",
+                (status, attempts, next_attempt_at, error, now, status, now, message_id)
+            )
+    
+    def _batch(self, batch_id: str) -> List[Dict]:
+        with self._lock:
+            rows = self._db.execute(
+                """SELECT o.* FROM outbox_reports r JOIN outbox o ON o.id = r.message_id
+                   WHERE r.batch_id = ? ORDER BY o.id""",
+                (batch_id,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            counts = dict(self._db.execute(
+                "SELECT status, COUNT(*) FROM outbox GROUP BY status"
+            ).fetchall())
+        return {
+            'pending': counts.get('pending', 0),
+            'in_flight': counts.get('in_flight', 0),
+            'delivered': counts.get('delivered', 0),
+            'failed': counts.get('failed', 0),
+            'workers': max(len(self._tasks) - 1, 0),
+        }
+    
+    # --- async API ---
+    
+    async def enqueue(
+        self,
+        batch_id: str,
+        incident_type: str,
+        severity: str,
+        location: Dict,
+        description: str
+    ) -> Dict:
+        """
+        Queue notifications to every authority for an incident type
+        
+        Args:
+            batch_id: Source of the notifications (e.g. 'incident:<id>')
+            incident_type: Type of incident
+            severity: Severity level
+            location: Location {lat, lng, address}
+            description: Description
+            
+        Returns:
+            Delivery status per authority (as stored, after deduplication)
+        """
+        authority_config = AUTHORITY_MAPPING.get(incident_type.lower(), {})
+        authorities = authority_config.get('authorities', [])
+        endpoints = authority_config.get('api_endpoints', {})
+        payload = build_authority_payload(incident_type, severity, location, description)
+        payload['report_count'] = 1
+        payload['reports'] = [{
+            'batch_id': batch_id,
+            'severity': severity,
+            'location': location,
+            'description': description,
+            'timestamp': payload['timestamp'],
+        }]
+        
+        # Reports without coordinates are never clustered with others
+        try:
+            cell = (
+                f"{math.floor(float(location['lat']) / NOTIFY_CELL_DEGREES)}:"
+                f"{math.floor(float(location['lng']) / NOTIFY_CELL_DEGREES)}"
+            )
+        except (KeyError, TypeError, ValueError):
+            cell = batch_id
+        
+        messages = [
+            (authority, endpoints[authority], f"{authority}|{incident_type.lower()}|{cell}", payload)
+            for authority in authorities if endpoints.get(authority)
+        ]
+        loop = asyncio.get_running_loop()
+        if messages:
+            await loop.run_in_executor(None, self._insert, batch_id, messages)
+            if self._wakeup is not None:
+                self._wakeup.set()
+        
+        stored = await self.status(batch_id)
+        return {
+            authority: stored.get(authority, {'status': 'no_endpoint'})
+            for authority in authorities
+        }
+    
+    async def status(self, batch_id: str) -> Dict:
+        """Delivery progress per authority for one batch"""
+        loop = asyncio.get_running_loop()
+        rows = await loop.run_in_executor(None, self._batch, batch_id)
+        return {
+            row['authority']: {
+                'status': row['status'],
+                'message_id': row['id'],
+                'rolled_up': row['batch_id'] != batch_id,
+                'report_count': json.loads(row['payload']).get('report_count', 1),
+                'attempts': row['attempts'],
+                'last_error': row['last_error'],
+                'next_attempt_at': (
+                    datetime.fromtimestamp(row['next_attempt_at']).isoformat()
+                    if row['status'] == 'pending' else None
+                ),
+                'delivered_at': (
+                    datetime.fromtimestamp(row['delivered_at']).isoformat()
+                    if row['delivered_at'] else None
+                ),
             }
+            for row in rows
+        }
+    
+    def start(self, workers: int) -> None:
+        """Start the dispatcher and delivery workers on the running loop"""
+        if self._tasks:
+            return
+        self._wakeup = asyncio.Event()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=workers * 2)
+        self._tasks = [asyncio.create_task(self._dispatch(queue, workers * 2))]
+        self._tasks += [asyncio.create_task(self._deliver(queue)) for _ in range(workers)]
+    
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._wakeup = None
+    
+    async def _dispatch(self, queue: asyncio.Queue, batch_size: int) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                rows = await loop.run_in_executor(None, self._claim, batch_size)
+            except Exception as e:
+                logger.error(f"Outbox claim failed: {e}")
+                rows = []
+            for row in rows:
+                await queue.put(row)
+            if len(rows) < batch_size:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), OUTBOX_POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+    
+    async def _deliver(self, queue: asyncio.Queue) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            row = await queue.get()
+            attempts = row['attempts'] + 1
+            result = await send_authority_notification(
+                row['authority'], row['endpoint'], json.loads(row['payload']),
+                idempotency_key=row['idempotency_key']
+            )
+            
+            if result['status'] == 'success':
+                status, next_attempt_at, error = 'delivered', time.time(), None
+            elif result['status'] == 'rate_limited':
+                # Not a failed attempt: just wait for the endpoint's bucket
+                attempts -= 1
+                status, error = 'pending', 'rate limited'
+                next_attempt_at = time.time() + result['retry_after']
+            else:
+                error = result.get('error') or f"HTTP {result.get('code')}"
+                code = result.get('code') or 0
+                permanent = 400 <= code < 500 and code not in (408, 429)
+                if permanent or attempts >= OUTBOX_MAX_ATTEMPTS:
+                    status, next_attempt_at = 'failed', time.time()
+                else:
+                    delay = min(OUTBOX_BACKOFF_BASE * 2 ** (attempts - 1), OUTBOX_BACKOFF_MAX)
+                    status = 'pending'
+                    next_attempt_at = time.time() + delay * random.uniform(0.5, 1.0)
+            
+            try:
+                await loop.run_in_executor(
+                    None, self._update, row['id'], status, attempts, next_attempt_at, error
+                )
+            except Exception as e:
+                logger.error(f"Outbox update failed for message {row['id']}: {e}")
+            if status == 'failed':
+                logger.error(f"Notification to {row['authority']} failed for good: {error}")
+
+
+_notification_outbox: Optional[NotificationOutbox] = None
+
+
+def get_notification_outbox() -> NotificationOutbox:
+    """Notification outbox, opened on first use"""
+    global _notification_outbox
+    if _notification_outbox is None:
+        _notification_outbox = NotificationOutbox(OUTBOX_DB_PATH)
+    return _notification_outbox
+
+
+# ==============================================================================
+# IMAGE UPLOADS
+# ==============================================================================
+
+IMAGE_SIGNATURES = (
+    (b'\xff\xd8\xff', 'JPEG'),
+    (b'\x89PNG\r\n\x1a\n', 'PNG'),
+    (b'GIF87a', 'GIF'),
+    (b'GIF89a', 'GIF'),
+    (b'BM', 'BMP'),
+    (b'II*\x00', 'TIFF'),
+    (b'MM\x00*', 'TIFF'),
+)
+
+# Multipart framing (boundaries, part headers) on top of the image itself
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+class UploadRejected(Exception):
+    """Upload refused before (or while) its body is read"""
+    
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def sniff_image_format(header: bytes) -> Optional[str]:
+    """Image format from the leading magic bytes, or None"""
+    if header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+        return 'WEBP'
+    for signature, image_format in IMAGE_SIGNATURES:
+        if header.startswith(signature):
+            return image_format
+    return None
+
+
+class ImageUpload:
+    """
+    One image file streamed out of a multipart body
+    
+    Bytes go to a SpooledTemporaryFile, so at most IMAGE_SPOOL_BYTES of it
+    is held in memory. The header is checked as soon as it has arrived:
+    non-images and oversized dimensions are rejected without reading the
+    rest of the body.
+    """
+    
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.size = 0
+        self.format: Optional[str] = None
+        self.dimensions: Optional[Tuple[int, int]] = None
+        self.buffer = tempfile.SpooledTemporaryFile(max_size=IMAGE_SPOOL_BYTES)
+        self._header = bytearray()
+        self._digest = hashlib.sha256()
+    
+    def write(self, data: bytes) -> None:
+        self.size += len(data)
+        if self.size > IMAGE_MAX_BYTES:
+            raise UploadRejected(413, f"Image larger than {IMAGE_MAX_BYTES} bytes")
+        self.buffer.write(data)
+        self._digest.update(data)
+        if self.dimensions is None and len(self._header) < IMAGE_SNIFF_BYTES:
+            self._header += data[:IMAGE_SNIFF_BYTES - len(self._header)]
+            self._sniff(final=False)
+    
+    def finish(self) -> None:
+        if not self.size:
+            raise UploadRejected(400, "Empty image upload")
+        if self.dimensions is None:
+            self._sniff(final=True)
+    
+    def _sniff(self, final: bool) -> None:
+        if self.format is None:
+            if len(self._header) < 12 and not final:
+                return
+            self.format = sniff_image_format(bytes(self._header))
+            if not self.format:
+                raise UploadRejected(415, "Upload is not a supported image")
+        
+        if not HAS_PIL:
+            return
+        
+        # Image.open only parses the header; a truncated one raises until
+        # enough bytes have arrived. Pillow's decompression bomb check is
+        # a final answer, not a reason to wait for more bytes.
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter('error', Image.DecompressionBombWarning)
+                self.dimensions = Image.open(BytesIO(bytes(self._header))).size
+        except (Image.DecompressionBombError, Image.DecompressionBombWarning) as e:
+            raise UploadRejected(413, f"Image dimensions too large: {e}")
+        except Exception:
+            if final or len(self._header) >= IMAGE_SNIFF_BYTES:
+                raise UploadRejected(415, f"Unreadable {self.format} header")
+            return
+        
+        width, height = self.dimensions
+        if width * height > IMAGE_MAX_PIXELS:
+            raise UploadRejected(413, f"Image dimensions {width}x{height} too large")
+    
+    @property
+    def sha256(self) -> str:
+        return self._digest.hexdigest()
+    
+    def read(self) -> bytes:
+        self.buffer.seek(0)
+        return self.buffer.read()
+    
+    def close(self) -> None:
+        self.buffer.close()
+
+
+class MultipartImageReader:
+    """Feeds a streamed multipart body to ImageUploads for one file field"""
+    
+    def __init__(self, field_name: str, max_files: int = 1):
+        self.field_name = field_name
+        self.max_files = max_files
+        self.uploads: List[ImageUpload] = []
+        self._current: Optional[ImageUpload] = None
+        self._header_field = b''
+        self._header_value = b''
+        self._disposition = b''
     
-    return notifications
+    def on_part_begin(self) -> None:
+        self._current = None
+        self._disposition = b''
+    
+    def on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_field += data[start:end]
+    
+    def on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+    
+    def on_header_end(self) -> None:
+        if self._header_field.lower() == b'content-disposition':
+            self._disposition = self._header_value
+        self._header_field = b''
+        self._header_value = b''
+    
+    def on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._disposition)
+        if options.get(b'name', b'').decode('latin-1') != self.field_name or b'filename' not in options:
+            return
+        if len(self.uploads) >= self.max_files:
+            raise UploadRejected(400, f"At most {self.max_files} '{self.field_name}' file(s) accepted")
+        self._current = ImageUpload(options[b'filename'].decode('utf-8', 'replace'))
+        self.uploads.append(self._current)
+    
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._current is not None:
+            self._current.write(data[start:end])
+    
+    def on_part_end(self) -> None:
+        self._current = None
 
 
-def get_suggestions(incident_type: str, severity: str) -> List[str]:
+async def receive_image_uploads(
+    request: Request,
+    field_name: str = 'file',
+    max_files: int = 1
+) -> List[ImageUpload]:
     """
-    Get safety suggestions
+    Stream image files out of a multipart request
     
     Args:
-        incident_type: Type of incident
-        severity: Severity level
+        request: Incoming request (body not yet read)
+        field_name: Form field holding the images
+        max_files: Most files accepted in the field
         
     Returns:
-        List of suggestions
+        Validated uploads; the caller must close() them
+        
+    Raises:
+        UploadRejected: Missing, oversized or non-image upload
     """
-    suggestions = SAFETY_SUGGESTIONS.get(incident_type.lower(), [
-        'Stay alert and aware',
-        'Report to authorities if needed'
-    ])
+    body_cap = max_files * IMAGE_MAX_BYTES + MULTIPART_OVERHEAD_BYTES
+    content_length = request.headers.get('content-length', '')
+    if content_length.isdigit() and int(content_length) > body_cap:
+        raise UploadRejected(413, f"Upload larger than {body_cap} bytes")
+    
+    content_type, params = parse_options_header(request.headers.get('content-type', ''))
+    if content_type != b'multipart/form-data' or b'boundary' not in params:
+        raise UploadRejected(400, "Expected a multipart/form-data upload")
     
-    # Add urgency for critical incidents
-    if severity == 'CRITICAL':
-        suggestions.insert(0, '🚨 CRITICAL: Take immediate action for safety')
+    reader = MultipartImageReader(field_name, max_files)
+    parser = MultipartParser(params[b'boundary'], {
+        'on_part_begin': reader.on_part_begin,
+        'on_part_data': reader.on_part_data,
+        'on_part_end': reader.on_part_end,
+        'on_header_field': reader.on_header_field,
+        'on_header_value': reader.on_header_value,
+        'on_header_end': reader.on_header_end,
+        'on_headers_finished': reader.on_headers_finished,
+    })
     
-    return suggestions
+    received = 0
+    try:
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > body_cap:
+                raise UploadRejected(413, f"Upload larger than {body_cap} bytes")
+            parser.write(chunk)
+        parser.finalize()
+        
+        if not reader.uploads:
+            raise UploadRejected(400, f"Missing '{field_name}' file")
+        for upload in reader.uploads:
+            upload.finish()
+        return reader.uploads
+    except Exception:
+        for upload in reader.uploads:
+            upload.close()
+        raise
+
+
+async def receive_image_upload(request: Request, field_name: str = 'file') -> ImageUpload:
+    """Stream a single image file out of a multipart request"""
+    return (await receive_image_uploads(request, field_name, max_files=1))[0]
+
+
+class ImageWorkersBusy(Exception):
+    """Raised when the image worker queue is full"""
 
 
-def estimate_people_count(description: str) -> Optional[int]:
+class ImageWorkerPool:
     """
-    Estimate number of people involved
+    Bounded process pool for CPU-bound image work
+    
+    At most IMAGE_QUEUE_LIMIT jobs are queued or running; beyond that new
+    jobs are refused rather than piling up. Workers are started lazily
+    with 'spawn' so they never inherit the event loop or API clients.
+    """
+    
+    def __init__(self, workers: int, queue_limit: int):
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self.pending = 0
+        self.peak_pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.failed = 0
+        self._latencies: deque = deque(maxlen=200)
+    
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        if self.workers > 0 and self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return self._executor
+    
+    async def run(self, func, *args):
+        """
+        Run func(*args) in a worker process
+        
+        Raises:
+            ImageWorkersBusy: Queue is full
+        """
+        if self.pending >= self.queue_limit:
+            self.rejected += 1
+            raise ImageWorkersBusy(f"{self.pending} image jobs already queued")
+        
+        loop = asyncio.get_running_loop()
+        self.pending += 1
+        self.peak_pending = max(self.peak_pending, self.pending)
+        started = time.monotonic()
+        try:
+            try:
+                result = await loop.run_in_executor(self._get_executor(), func, *args)
+            except BrokenProcessPool:
+                # A worker died (e.g. OOM on a hostile image): start a fresh pool
+                logger.error("Image worker pool broken - restarting")
+                self._executor = None
+                raise
+            self.completed += 1
+            self._latencies.append(time.monotonic() - started)
+            return result
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.pending -= 1
+    
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+    
+    def snapshot(self) -> Dict:
+        latencies = sorted(self._latencies)
+        return {
+            'workers': self.workers,
+            'mode': 'process' if self.workers > 0 else 'thread',
+            'queue_depth': self.pending,
+            'peak_queue_depth': self.peak_pending,
+            'queue_limit': self.queue_limit,
+            'completed': self.completed,
+            'failed': self.failed,
+            'rejected': self.rejected,
+            'p50_ms': round(latencies[len(latencies) // 2] * 1000, 1) if latencies else None,
+            'p95_ms': round(latencies[int(len(latencies) * 0.95)] * 1000, 1) if latencies else None,
+        }
+
+
+image_workers = ImageWorkerPool(IMAGE_WORKERS, IMAGE_QUEUE_LIMIT)
+
+
+_image_results: "OrderedDict[str, Dict]" = OrderedDict()
+_image_cache_disk_count: Optional[int] = None
+_image_cache_count_lock = threading.Lock()
+
+
+def _image_cache_path(digest: str) -> str:
+    return os.path.join(IMAGE_CACHE_DIR, f"{digest}.json")
+
+
+def _load_image_cache_entry(digest: str) -> Optional[Dict]:
+    try:
+        with open(_image_cache_path(digest), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _evict_image_cache_files() -> None:
+    """Drop the oldest cache files until the disk tier is 90% full (caller holds the count lock)"""
+    global _image_cache_disk_count
+    entries = []
+    with os.scandir(IMAGE_CACHE_DIR) as it:
+        for entry in it:
+            if entry.name.endswith('.json'):
+                entries.append((entry.stat().st_mtime, entry.path))
+    entries.sort()
+    excess = len(entries) - int(IMAGE_CACHE_DISK_ENTRIES * 0.9)
+    for _, path in entries[:max(excess, 0)]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+    _image_cache_disk_count = len(entries) - max(excess, 0)
+
+
+def _save_image_cache_entry(digest: str, entry: Dict) -> None:
+    global _image_cache_disk_count
+    try:
+        os.makedirs(IMAGE_CACHE_DIR, exist_ok=True)
+        path = _image_cache_path(digest)
+        fd, tmp_path = tempfile.mkstemp(dir=IMAGE_CACHE_DIR, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, default=str)
+            with _image_cache_count_lock:
+                if _image_cache_disk_count is None:
+                    _image_cache_disk_count = sum(
+                        1 for name in os.listdir(IMAGE_CACHE_DIR) if name.endswith('.json')
+                    )
+                is_new = not os.path.exists(path)
+                os.replace(tmp_path, path)
+                if is_new:
+                    _image_cache_disk_count += 1
+                    if _image_cache_disk_count > IMAGE_CACHE_DISK_ENTRIES:
+                        _evict_image_cache_files()
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    except OSError as e:
+        logger.warning(f"Image cache write failed: {e}")
+
+
+async def get_cached_image_analysis(digest: str) -> Optional[Dict]:
+    """
+    Look up a previous analysis of the same image bytes
     
     Args:
-        description: Description text
+        digest: SHA-256 hex digest of the image
         
     Returns:
-        Estimated count or None
+        Cached {'authenticity', 'vision_analysis'} entry, or None
     """
-    desc_lower = description.lower()
+    entry = _image_results.get(digest)
+    if entry is None:
+        loop = asyncio.get_running_loop()
+        entry = await loop.run_in_executor(None, _load_image_cache_entry, digest)
+        if entry is None:
+            return None
+        _image_results[digest] = entry
     
-    # Simple heuristics
-    if 'many' in desc_lower or 'multiple' in desc_lower or 'crowd' in desc_lower:
-        return 10
-    elif 'two' in desc_lower or 'couple' in desc_lower or 'pair' in desc_lower:
-        return 2
-    elif 'person' in desc_lower or 'someone' in desc_lower or 'individual' in desc_lower:
-        return 1
-    elif 'group' in desc_lower:
-        return 5
+    if entry.get('stored_at', 0) + IMAGE_CACHE_TTL < time.time():
+        _image_results.pop(digest, None)
+        return None
     
-    return None
+    _image_results.move_to_end(digest)
+    while len(_image_results) > IMAGE_CACHE_SIZE:
+        _image_results.popitem(last=False)
+    return entry
+
+
+async def store_cached_image_analysis(
+    digest: str,
+    authenticity: Dict,
+    vision_analysis: Optional[Dict],
+    phash: Optional[int] = None
+) -> None:
+    """Cache an image analysis in memory and on disk"""
+    entry = {
+        'stored_at': time.time(),
+        'authenticity': authenticity,
+        'vision_analysis': vision_analysis,
+        'phash': f"{phash:016x}" if phash is not None else None,
+    }
+    _image_results[digest] = entry
+    _image_results.move_to_end(digest)
+    while len(_image_results) > IMAGE_CACHE_SIZE:
+        _image_results.popitem(last=False)
+    
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, _save_image_cache_entry, digest, entry)
 
 
-def estimate_duration(incident_type: str) -> Optional[str]:
+class PerceptualHashIndex:
     """
-    Estimate incident duration
+    Multi-index hash table of 64-bit perceptual hashes
     
-    Args:
-        incident_type: Type of incident
-        
-    Returns:
-        Estimated duration string
+    Each hash is split into BANDS 16-bit bands with one table per band.
+    Two hashes within Hamming distance r differ by at most r // BANDS bits
+    in at least one band, so a query probes only the buckets within that
+    radius of each band instead of comparing against every stored image.
+    Entries are appended to a log file by flush() in the thread pool, in
+    batches, and reloaded on startup.
     """
-    durations = {
-        'construction': '2-8 hours',
-        'traffic': '30 minutes - 2 hours',
-        'accident': '1-4 hours',
-        'tree_fall': '2-6 hours',
-        'power_issue': '1-12 hours',
-        'violence': '15-60 minutes',
-        'flood': '6-72 hours',
-        'fire': '2-6 hours'
-    }
     
-    return durations.get(incident_type.lower())
+    BANDS = 4
+    BAND_BITS = 16
+    
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.hashes: List[int] = []
+        self.digests: List[str] = []
+        self._known: set = set()
+        self._tables: List[Dict[int, List[int]]] = [{} for _ in range(self.BANDS)]
+        self._unwritten: List[str] = []
+        self._write_lock = threading.Lock()
+        if path:
+            self._load()
+    
+    def __len__(self) -> int:
+        return len(self.hashes)
+    
+    def _bands(self, phash: int) -> List[int]:
+        mask = (1 << self.BAND_BITS) - 1
+        return [(phash >> (i * self.BAND_BITS)) & mask for i in range(self.BANDS)]
+    
+    def _insert(self, digest: str, phash: int) -> None:
+        position = len(self.hashes)
+        self.hashes.append(phash)
+        self.digests.append(digest)
+        self._known.add(digest)
+        for table, band in zip(self._tables, self._bands(phash)):
+            table.setdefault(band, []).append(position)
+    
+    def _load(self) -> None:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    parts = line.split()
+                    if len(parts) == 2 and parts[0] not in self._known:
+                        self._insert(parts[0], int(parts[1], 16))
+        except (OSError, ValueError):
+            pass
+    
+    def add(self, digest: str, phash: int) -> None:
+        """Index an image in memory (no-op if its digest is already indexed)"""
+        if digest in self._known:
+            return
+        self._insert(digest, phash)
+        if self.path:
+            self._unwritten.append(f"{digest} {phash:016x}\n")
+    
+    def _append(self) -> None:
+        with self._write_lock:
+            lines, self._unwritten = self._unwritten, []
+            if not lines:
+                return
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.writelines(lines)
+            except OSError as e:
+                logger.warning(f"Perceptual hash index write failed: {e}")
+    
+    async def flush(self) -> None:
+        """Append entries added since the last flush to the index file"""
+        if self._unwritten:
+            await asyncio.get_running_loop().run_in_executor(None, self._append)
+    
+    def _probe(self, band: int, radius: int):
+        yield band
+        for bits in range(1, radius + 1):
+            for flips in itertools.combinations(range(self.BAND_BITS), bits):
+                value = band
+                for bit in flips:
+                    value ^= 1 << bit
+                yield value
+    
+    def query(self, phash: int, max_distance: int, limit: int = 5) -> List[Tuple[str, int]]:
+        """
+        Find indexed images within a Hamming distance
+        
+        Args:
+            phash: Query hash
+            max_distance: Largest Hamming distance to return
+            limit: Maximum number of matches
+            
+        Returns:
+            (digest, distance) pairs, closest first
+        """
+        radius = max_distance // self.BANDS
+        candidates = set()
+        for table, band in zip(self._tables, self._bands(phash)):
+            for probe in self._probe(band, radius):
+                candidates.update(table.get(probe, ()))
+        
+        matches = []
+        for position in candidates:
+            distance = bin(self.hashes[position] ^ phash).count('1')
+            if distance <= max_distance:
+                matches.append((distance, self.digests[position]))
+        matches.sort()
+        return [(digest, distance) for distance, digest in matches[:limit]]
+
+
+_image_hash_index: Optional[PerceptualHashIndex] = None
+
+
+def get_image_hash_index() -> PerceptualHashIndex:
+    """Perceptual hash index, loaded from disk on first use"""
+    global _image_hash_index
+    if _image_hash_index is None:
+        _image_hash_index = PerceptualHashIndex(os.path.join(IMAGE_CACHE_DIR, 'phash_index.txt'))
+        logger.info(f"Perceptual hash index: {len(_image_hash_index)} images")
+    return _image_hash_index
+
+
+def find_near_duplicates(digest: str, phash: int) -> List[Dict]:
+    """Previously seen images that look like this one (excluding itself)"""
+    matches = get_image_hash_index().query(phash, IMAGE_DUPLICATE_DISTANCE, limit=6)
+    return [
+        {'sha256': other, 'distance': distance}
+        for other, distance in matches if other != digest
+    ][:5]
+
+
+async def reuse_near_duplicate_vision(near_duplicates: List[Dict]) -> Tuple[Optional[Dict], Optional[str]]:
+    """Cached Vision result of a close enough near-duplicate, if there is one"""
+    for match in near_duplicates:
+        if match['distance'] > IMAGE_REUSE_DISTANCE:
+            break
+        cached = await get_cached_image_analysis(match['sha256'])
+        if cached and cached.get('vision_analysis'):
+            return cached['vision_analysis'], match['sha256']
+    return None, None
+
 
 
 # ==============================================================================
@@ -874,61 +3185,256 @@ async def analyze_incident(request: IncidentAnalysisRequest) -> IncidentAnalysis
     try:
         logger.info(f"Analyzing incident: {request.type}")
         
-        # Extract keywords
-        keywords = extract_keywords(request.description)
-        
-        # TRY: Use Groq LLM for analysis
-        groq_analysis = None
-        if groq_client:
-            groq_analysis = await analyze_with_groq(request.description, request.type)
-            logger.info(f"Groq analysis completed: {groq_analysis}")
-        
-        # Use Groq analysis if available, else rule-based
-        if groq_analysis:
-            severity = groq_analysis.get('severity', 'MEDIUM')
-            confidence = groq_analysis.get('confidence', 0.85)
-            authorities = groq_analysis.get('authorities_needed', [])
-            suggestions = groq_analysis.get('suggested_actions', [])
-            estimated_people = groq_analysis.get('estimated_affected_people')
-            emergency_detected = severity == 'CRITICAL'
+        # Rule-based answer is ready immediately; a confident local model
+        # prediction replaces the LLM altogether
+        local_prediction = classify_locally(request.type, request.description)
+        response = build_incident_analysis(request, local_prediction=local_prediction)
+        
+        # TRY: Use Groq LLM if it answers within the latency budget
+        if groq_client and response.analysis_source != 'model':
+            groq_analysis, source = await hedged_groq_analysis(
+                request.description, request.type, LATENCY_BUDGETS['analyze']
+            )
+            if groq_analysis:
+                response = build_incident_analysis(request, groq_analysis, source)
+        
+        logger.info(f"✅ Analysis complete. Severity: {response.severity}, Risk: {response.risk_score}, Source: {response.analysis_source}")
+        
+        return response
+        
+    except Exception as e:
+        logger.error(f"Analysis error: {str(e)}")
+        raise HTTPException(status_code=500, detail="Analysis failed")
+
+
+def build_incident_analysis(
+    request: IncidentAnalysisRequest,
+    groq_analysis: Optional[Dict] = None,
+    source: str = 'llm',
+    local_prediction: Optional[Dict] = None,
+    rule_scores: Optional[Dict] = None
+) -> IncidentAnalysisResponse:
+    """
+    Combine an optional Groq analysis with the rule engine
+    
+    Args:
+        request: Incident analysis request
+        groq_analysis: Groq LLM result, or None for rule-based only
+        source: Where groq_analysis came from (llm or cache)
+        local_prediction: classify_locally() result, used when confident
+        rule_scores: This incident's {severity, risk_score} row from
+            score_incidents_batch, when the caller scored a whole batch
+        
+    Returns:
+        Analysis response
+    """
+    # Single keyword scan shared by all rule functions below
+    matched = match_rule_words(request.description)
+    
+    # Use Groq analysis if available, else rule-based
+    if groq_analysis:
+        severity = groq_analysis.get('severity', 'MEDIUM')
+        confidence = groq_analysis.get('confidence', 0.85)
+        authorities = groq_analysis.get('authorities_needed', [])
+        suggestions = groq_analysis.get('suggested_actions', [])
+        estimated_people = groq_analysis.get('estimated_affected_people')
+        emergency_detected = severity == 'CRITICAL'
+    elif local_prediction and local_prediction['severity_confidence'] >= LOCAL_MODEL_CONFIDENCE:
+        source = 'model'
+        severity = local_prediction['severity']
+        confidence = round(local_prediction['severity_confidence'], 3)
+        authorities = [a['authorities'] for a in AUTHORITY_MAPPING.values()][0]
+        suggestions = get_suggestions(request.type, severity)
+        estimated_people = estimate_people_count(request.description, matched)
+        emergency_detected = severity == 'CRITICAL'
+    else:
+        source = 'rules'
+        if rule_scores is not None:
+            severity = rule_scores['severity']
         else:
-            severity = calculate_severity(request.type, request.description)
-            confidence = 0.85
-            authorities = [a['authorities'] for a in AUTHORITY_MAPPING.values()][0]
-            suggestions = get_suggestions(request.type, severity)
-            estimated_people = estimate_people_count(request.description)
-            emergency_detected = severity == 'CRITICAL'
-        
-        # Calculate risk score
+            severity = calculate_severity(request.type, request.description, matched)
+        confidence = 0.85
+        authorities = [a['authorities'] for a in AUTHORITY_MAPPING.values()][0]
+        suggestions = get_suggestions(request.type, severity)
+        estimated_people = estimate_people_count(request.description, matched)
+        emergency_detected = severity == 'CRITICAL'
+    
+    # Calculate risk score (the batch score only holds for the rule severity)
+    if rule_scores is not None and severity == rule_scores['severity']:
+        risk_score = rule_scores['risk_score']
+    else:
         risk_score = calculate_risk_score(
             request.type,
             severity,
             request.description,
             request.has_photos,
-            request.has_video
+            request.has_video,
+            matched
         )
+    
+    estimated_duration = estimate_duration(request.type)
+    
+    return IncidentAnalysisResponse(
+        classification=request.type,
+        confidence=confidence,
+        severity=severity,
+        risk_score=risk_score,
+        suggestions=suggestions,
+        emergency_detected=emergency_detected,
+        estimated_people=estimated_people,
+        estimated_duration=estimated_duration,
+        authorities_to_notify=authorities,
+        analysis_source=source
+    )
+
+
+@app.post(
+    "/api/analyze/batch",
+    tags=["AI Analysis"]
+)
+async def analyze_incident_batch(request: BatchAnalysisRequest, stream: Optional[bool] = None):
+    """
+    Analyze many incidents in one request
+    
+    Rule severities and risk scores for the whole batch come from one
+    score_incidents_batch pass. LLM calls fan out under the shared
+    BATCH_LLM_CONCURRENCY limit until one request-wide deadline
+    (LATENCY_BUDGETS['analyze_batch']); items not reached by then use the
+    rules. Results keep the input order. Large batches (or stream=true)
+    are returned as NDJSON, one line per incident, as soon as each
+    in-order result is ready; stream=false always returns one JSON body.
+    
+    Args:
+        request: Batch of incident analysis requests
+        stream: Force NDJSON on (true) or off (false); default by batch size
         
-        estimated_duration = estimate_duration(request.type)
-        
-        response = IncidentAnalysisResponse(
-            classification=request.type,
-            confidence=confidence,
-            severity=severity,
-            risk_score=risk_score,
-            suggestions=suggestions,
-            emergency_detected=emergency_detected,
-            estimated_people=estimated_people,
-            estimated_duration=estimated_duration,
-            authorities_to_notify=authorities
+    Returns:
+        Ordered analysis results
+    """
+    incidents = request.incidents
+    if len(incidents) > BATCH_MAX_SIZE:
+        raise HTTPException(status_code=413, detail=f"Batch too large (max {BATCH_MAX_SIZE})")
+    
+    logger.info(f"Analyzing batch of {len(incidents)} incidents")
+    
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + LATENCY_BUDGETS['analyze_batch']
+    use_llm = request.use_llm and groq_client is not None
+    
+    rule_scores: List[Optional[Dict]] = [None] * len(incidents)
+    if HAS_NUMPY and incidents:
+        scores = await asyncio.get_running_loop().run_in_executor(
+            None,
+            functools.partial(
+                score_incidents_batch,
+                [incident.type for incident in incidents],
+                [incident.description for incident in incidents],
+                [incident.has_photos for incident in incidents],
+                [incident.has_video for incident in incidents]
+            )
         )
+        rule_scores = [
+            {'severity': severity, 'risk_score': risk_score}
+            for severity, risk_score in zip(scores['severity'].tolist(), scores['risk_score'].tolist())
+        ]
+    
+    async def analyze_one(incident: IncidentAnalysisRequest, scores: Optional[Dict]) -> Dict:
+        local_prediction = classify_locally(incident.type, incident.description)
+        confident = bool(local_prediction) and local_prediction['severity_confidence'] >= LOCAL_MODEL_CONFIDENCE
+        groq_analysis, source = None, 'rules'
+        if use_llm and not confident:
+            key = analysis_key(incident.type, incident.description)
+            groq_analysis = get_cached_analysis(key)
+            if groq_analysis is not None:
+                source = 'cache'
+            elif loop.time() < deadline and not circuit_breakers['groq'].is_open():
+                # The call is cancelled at the deadline (not left running),
+                # so the semaphore bounds real Groq load
+                async with batch_llm_semaphore:
+                    remaining = deadline - loop.time()
+                    if remaining > 0:
+                        groq_analysis = await analyze_with_groq(
+                            incident.description, incident.type, timeout=remaining
+                        )
+                        store_cached_analysis(key, groq_analysis)
+                        source = 'llm' if groq_analysis else 'rules'
+        return build_incident_analysis(
+            incident, groq_analysis, source, local_prediction, scores
+        ).model_dump()
+    
+    tasks = [
+        asyncio.ensure_future(analyze_one(incident, scores))
+        for incident, scores in zip(incidents, rule_scores)
+    ]
+    
+    async def ordered_results():
+        try:
+            for index, task in enumerate(tasks):
+                try:
+                    yield index, await task
+                except Exception as e:
+                    logger.error(f"Batch analysis error at {index}: {e}")
+                    yield index, {'error': 'Analysis failed'}
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    if stream or (stream is None and len(incidents) > BATCH_STREAM_THRESHOLD):
+        async def ndjson():
+            async for index, result in ordered_results():
+                yield json.dumps({'index': index, **result}) + "\n"
         
-        logger.info(f"✅ Analysis complete. Severity: {severity}, Risk: {risk_score}, Groq: {bool(groq_analysis)}")
-        
-        return response
+        return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+    
+    results = [result async for _, result in ordered_results()]
+    
+    return {
+        'status': 'success',
+        'count': len(results),
+        'results': results,
+        'timestamp': datetime.now().isoformat()
+    }
+
+
+@app.post(
+    "/api/score/batch",
+    tags=["AI Analysis"]
+)
+async def score_batch(request: BatchScoreRequest) -> Dict:
+    """
+    Rule-engine severity and risk score for many incidents (no LLM),
+    e.g. to re-score the incident history after a rule change
+    
+    Args:
+        request: Parallel arrays of types, descriptions and evidence flags
         
-    except Exception as e:
-        logger.error(f"Analysis error: {str(e)}")
-        raise HTTPException(status_code=500, detail="Analysis failed")
+    Returns:
+        Parallel arrays of severities and risk scores
+    """
+    if not HAS_NUMPY:
+        raise HTTPException(status_code=503, detail="Batch scoring requires NumPy")
+    
+    try:
+        scores = await asyncio.get_running_loop().run_in_executor(
+            None,
+            functools.partial(
+                score_incidents_batch,
+                request.types,
+                request.descriptions,
+                request.has_photos,
+                request.has_video
+            )
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    
+    return {
+        'status': 'success',
+        'count': len(request.descriptions),
+        'severities': scores['severity'].tolist(),
+        'risk_scores': scores['risk_score'].tolist(),
+        'timestamp': datetime.now().isoformat()
+    }
 
 
 @app.post(
@@ -1019,20 +3525,26 @@ async def notify_authority(request: AuthorityNotificationRequest) -> Dict:
     """
     Notify REAL India government authorities using their official APIs
     
+    Notifications are written to the durable outbox and delivered in the
+    background; poll /api/notifications/{batch_id} for delivery progress.
+    Repeated requests for the same incident are not sent twice.
+    
     Args:
         request: Authority notification request
         
     Returns:
-        Notification status from each authority
+        Queued notification status for each authority
     """
     try:
         logger.info(f"Notifying authorities about incident {request.incident_id}")
         
         incident = request.incident
         location = incident.get('location', {})
+        batch_id = f"incident-{request.incident_id}"
         
-        # Send to real India authority APIs
-        notifications = await notify_india_authorities(
+        # Queue for the real India authority APIs
+        notifications = await get_notification_outbox().enqueue(
+            batch_id,
             incident_type=incident.get('type', 'Unknown'),
             severity=incident.get('severity', 'UNKNOWN'),
             location=location,
@@ -1060,7 +3572,7 @@ async def notify_authority(request: AuthorityNotificationRequest) -> Dict:
         👤 REPORTED BY: User {incident.get('reporterId', 'Unknown')}
         ⏰ TIME: {datetime.now().isoformat()}
         
-        ✅ AUTHORITIES NOTIFIED:
+        ✅ AUTHORITIES NOTIFIED (delivery status):
         """
         
         for authority, status in notifications.items():
@@ -1077,16 +3589,18 @@ async def notify_authority(request: AuthorityNotificationRequest) -> Dict:
         Integration: SafeRoute AI v2.0
         """
         
-        logger.info(f"✅ Authorities notified: {notifications}")
+        logger.info(f"✅ Authority notifications queued: {notifications}")
         
         return {
-            'status': 'notified',
+            'status': 'queued',
             'incident_id': request.incident_id,
+            'batch_id': batch_id,
+            'status_url': f"/api/notifications/{batch_id}",
             'authority_responses': notifications,
             'timestamp': datetime.now().isoformat(),
             'message_preview': message,
             'total_authorities': len(notifications),
-            'successful': sum(1 for s in notifications.values() if s.get('status') == 'success')
+            'successful': sum(1 for s in notifications.values() if s.get('status') == 'delivered')
         }
         
     except Exception as e:
@@ -1158,8 +3672,10 @@ async def handle_emergency(request: EmergencyRequest) -> Dict:
         emergency_type = request.type or 'OTHER'
         ai_guidance = guidance.get(emergency_type, guidance['OTHER'])
         
-        # Notify authorities in real-time
-        authority_status = await notify_india_authorities(
+        # Queue authority notifications (delivered in the background)
+        batch_id = f"emergency-{request.emergency_id}"
+        authority_status = await get_notification_outbox().enqueue(
+            batch_id,
             incident_type='EMERGENCY_' + emergency_type,
             severity='CRITICAL',
             location=request.location,
@@ -1173,6 +3689,7 @@ async def handle_emergency(request: EmergencyRequest) -> Dict:
             'guidance': ai_guidance,
             'authorities_notified': list(authority_status.keys()),
             'authority_status': authority_status,
+            'notification_status_url': f"/api/notifications/{batch_id}" if authority_status else None,
             'nearby_users_alerted': True,
             'emergency_contacts_notified': True,
             'estimated_response_time': '5-15 minutes',
@@ -1185,11 +3702,160 @@ async def handle_emergency(request: EmergencyRequest) -> Dict:
         raise HTTPException(status_code=500, detail="Emergency handling failed")
 
 
+@app.get(
+    "/api/notifications/{batch_id}",
+    tags=["Authority Notification"]
+)
+async def notification_status(batch_id: str) -> Dict:
+    """
+    Delivery progress of queued authority notifications
+    
+    Args:
+        batch_id: Batch returned by /api/notify-authority or /api/emergency
+        
+    Returns:
+        Per-authority delivery status, attempts and last error
+    """
+    authorities = await get_notification_outbox().status(batch_id)
+    if not authorities:
+        raise HTTPException(status_code=404, detail=f"No notifications for {batch_id}")
+    
+    statuses = [a['status'] for a in authorities.values()]
+    return {
+        'batch_id': batch_id,
+        'status': (
+            'delivered' if all(s == 'delivered' for s in statuses)
+            else 'failed' if all(s in ('delivered', 'failed') for s in statuses)
+            else 'in_progress'
+        ),
+        'authorities': authorities,
+        'delivered': statuses.count('delivered'),
+        'total': len(statuses),
+        'timestamp': datetime.now().isoformat()
+    }
+
+
+async def analyze_uploaded_images(uploads: List[ImageUpload]) -> List[Dict]:
+    """
+    Authenticity, near-duplicates and Vision analysis for uploaded images
+    
+    Images seen before (exact or near-duplicate) are answered from the
+    cache; all others go to Vision together in one batched request.
+    
+    Args:
+        uploads: Validated image uploads
+        
+    Returns:
+        Analysis result per upload, in order
+    """
+    async def inspect(upload: ImageUpload) -> Dict:
+        digest = upload.sha256
+        cached = await get_cached_image_analysis(digest)
+        # Entries without a Vision result are retried once Vision is back
+        cache_hit = bool(cached and (cached['vision_analysis'] or not vision_client))
+        
+        if cached and cached.get('phash'):
+            authenticity = cached['authenticity']
+            phash = int(cached['phash'], 16)
+        else:
+            inspection = await image_workers.run(inspect_image, upload.read())
+            authenticity, phash = inspection['authenticity'], inspection['phash']
+        logger.info(f"Image authenticity check: {authenticity}")
+        near_duplicates = find_near_duplicates(digest, phash) if phash is not None else []
+        
+        vision_analysis, reused_from = None, None
+        if cache_hit:
+            vision_analysis = cached['vision_analysis']
+            logger.info(f"Image cache hit: {digest[:12]}")
+        else:
+            # Skip Vision if a near-duplicate was already analyzed
+            vision_analysis, reused_from = await reuse_near_duplicate_vision(near_duplicates)
+        
+        return {
+            'upload': upload,
+            'digest': digest,
+            'cache_hit': cache_hit,
+            'authenticity': authenticity,
+            'phash': phash,
+            'near_duplicates': near_duplicates,
+            'vision_analysis': vision_analysis,
+            'reused_from': reused_from,
+        }
+    
+    items = await asyncio.gather(*(inspect(upload) for upload in uploads))
+    
+    # Analyze with Google Vision API
+    pending = [item for item in items if not item['vision_analysis'] and not item['cache_hit']]
+    if pending:
+        analyses = await analyze_images_with_vision([item['upload'].read() for item in pending])
+        for item, analysis in zip(pending, analyses):
+            item['vision_analysis'] = analysis
+    
+    results = []
+    for item in items:
+        digest, authenticity, phash = item['digest'], item['authenticity'], item['phash']
+        if not item['cache_hit']:
+            await store_cached_image_analysis(digest, authenticity, item['vision_analysis'], phash)
+        if phash is not None:
+            get_image_hash_index().add(digest, phash)
+        if item['near_duplicates']:
+            authenticity = {
+                **authenticity,
+                'warnings': authenticity.get('warnings', []) + [
+                    f"Looks like {len(item['near_duplicates'])} previously uploaded image(s)"
+                ]
+            }
+        
+        result = {
+            'filename': item['upload'].filename,
+            'sha256': digest,
+            'cached': item['cache_hit'],
+            'near_duplicates': item['near_duplicates'],
+            'vision_reused_from': item['reused_from'],
+            'authenticity': authenticity,
+        }
+        vision_analysis = item['vision_analysis']
+        if vision_analysis:
+            result.update({
+                'status': 'success',
+                'vision_analysis': vision_analysis,
+                'detection_confidence': vision_analysis.get('confidence_score', 0),
+            })
+        else:
+            result.update({
+                'status': 'partial',
+                'message': 'Vision API not available - authenticity check completed',
+            })
+        results.append(result)
+    
+    # One off-loop append for every image indexed by this request
+    await get_image_hash_index().flush()
+    return results
+
+
+def multipart_files_schema(field_name: str, multiple: bool) -> Dict:
+    """OpenAPI request body for endpoints that stream their own uploads"""
+    file_schema = {'type': 'string', 'format': 'binary'}
+    if multiple:
+        file_schema = {'type': 'array', 'items': file_schema}
+    return {
+        'requestBody': {
+            'required': True,
+            'content': {'multipart/form-data': {'schema': {
+                'type': 'object',
+                'required': [field_name],
+                'properties': {field_name: file_schema}
+            }}}
+        }
+    }
+
+
 @app.post(
     "/api/analyze-image",
-    tags=["Image Analysis"]
+    tags=["Image Analysis"],
+    openapi_extra=multipart_files_schema('file', multiple=False)
 )
-async def analyze_image(file: UploadFile = File(...)) -> Dict:
+async def analyze_image(request: Request) -> Dict:
     """
     Analyze incident image using Google Vision API
     - Detect objects and hazards
@@ -1197,47 +3863,90 @@ async def analyze_image(file: UploadFile = File(...)) -> Dict:
     - Extract text from images
     - Google Lens style analysis
     
+    The upload is streamed with a size cap and rejected early (413/415)
+    if its header is not an image or its dimensions are too large.
+    Results are cached by SHA-256 of the image, so repeat uploads of the
+    same photo skip the EXIF parse and Vision calls. Resized or recompressed
+    copies of earlier uploads are found by perceptual hash, listed in
+    'near_duplicates' and reuse the earlier Vision result.
+    
     Args:
-        file: Image file upload
+        request: multipart/form-data request with a 'file' image
         
     Returns:
         Vision analysis results
     """
     try:
-        logger.info(f"Analyzing image: {file.filename}")
-        
-        image_data = await file.read()
-        
-        # Verify authenticity
-        authenticity = verify_image_authenticity(image_data)
-        logger.info(f"Image authenticity check: {authenticity}")
+        upload = await receive_image_upload(request)
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    
+    try:
+        logger.info(f"Analyzing image: {upload.filename} ({upload.format}, {upload.size} bytes)")
         
-        # Analyze with Google Vision API
-        vision_analysis = await analyze_image_with_vision(image_data)
+        result = (await analyze_uploaded_images([upload]))[0]
         
-        if vision_analysis:
-            logger.info(f"✅ Google Vision analysis complete")
-            return {
-                'status': 'success',
-                'filename': file.filename,
-                'authenticity': authenticity,
-                'vision_analysis': vision_analysis,
-                'detection_confidence': vision_analysis.get('confidence_score', 0),
-                'timestamp': datetime.now().isoformat()
-            }
+        if result['status'] == 'success':
+            logger.info("✅ Google Vision analysis complete")
         else:
             logger.warning("Vision API unavailable - returning authenticity check only")
-            return {
-                'status': 'partial',
-                'filename': file.filename,
-                'authenticity': authenticity,
-                'message': 'Vision API not available - authenticity check completed',
-                'timestamp': datetime.now().isoformat()
-            }
         
+        return {**result, 'timestamp': datetime.now().isoformat()}
+        
+    except ImageWorkersBusy as e:
+        logger.warning(f"Image analysis rejected: {e}")
+        raise HTTPException(status_code=503, detail="Image analysis busy, retry shortly")
+    except Exception as e:
+        logger.error(f"Image analysis error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Image analysis failed: {str(e)}")
+    finally:
+        upload.close()
+
+
+@app.post(
+    "/api/analyze-images",
+    tags=["Image Analysis"],
+    openapi_extra=multipart_files_schema('files', multiple=True)
+)
+async def analyze_images(request: Request) -> Dict:
+    """
+    Analyze several photos of one incident in a single call
+    
+    Same per-image analysis as /api/analyze-image, but all photos that
+    need Vision are sent in one batched request.
+    
+    Args:
+        request: multipart/form-data request with up to IMAGE_MAX_FILES 'files'
+        
+    Returns:
+        Per-image results, in upload order
+    """
+    try:
+        uploads = await receive_image_uploads(request, 'files', max_files=IMAGE_MAX_FILES)
+    except UploadRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    
+    try:
+        logger.info(f"Analyzing {len(uploads)} images")
+        
+        results = await analyze_uploaded_images(uploads)
+        
+        return {
+            'status': 'success' if all(r['status'] == 'success' for r in results) else 'partial',
+            'count': len(results),
+            'images': results,
+            'timestamp': datetime.now().isoformat()
+        }
+        
+    except ImageWorkersBusy as e:
+        logger.warning(f"Image analysis rejected: {e}")
+        raise HTTPException(status_code=503, detail="Image analysis busy, retry shortly")
     except Exception as e:
         logger.error(f"Image analysis error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Image analysis failed: {str(e)}")
+    finally:
+        for upload in uploads:
+            upload.close()
 
 
 @app.post(
@@ -1257,13 +3966,17 @@ async def geocode_address(address: str) -> Dict:
     try:
         logger.info(f"Geocoding: {address}")
         
-        result = await get_geocoding(address)
+        key = normalize_address(address)
+        result, source = (
+            await lookup_geocoding('geocode', key, {'address': address}) if key else (None, 'api')
+        )
         
         if result:
-            logger.info(f"✅ Geocoding success: {result}")
+            logger.info(f"✅ Geocoding success ({source}): {result}")
             return {
                 'status': 'success',
                 'result': result,
+                'cached': source != 'api',
                 'timestamp': datetime.now().isoformat()
             }
         else:
@@ -1271,6 +3984,7 @@ async def geocode_address(address: str) -> Dict:
                 'status': 'not_found',
                 'address': address,
                 'message': 'Address not found or API unavailable',
+                'cached': source != 'api',
                 'timestamp': datetime.now().isoformat()
             }
         
@@ -1279,6 +3993,45 @@ async def geocode_address(address: str) -> Dict:
         raise HTTPException(status_code=500, detail="Geocoding failed")
 
 
+@app.post(
+    "/api/reverse-geocode",
+    tags=["Location Services"]
+)
+async def reverse_geocode(lat: float, lng: float) -> Dict:
+    """
+    Find the address at coordinates using Google Maps API
+    
+    Args:
+        lat: Latitude
+        lng: Longitude
+        
+    Returns:
+        Geocoding result with formatted_address
+    """
+    try:
+        cell = quantize_coordinates(lat, lng)
+        result, source = await lookup_geocoding('reverse', cell, {'latlng': cell})
+        
+        if result:
+            return {
+                'status': 'success',
+                'result': result,
+                'cached': source != 'api',
+                'timestamp': datetime.now().isoformat()
+            }
+        return {
+            'status': 'not_found',
+            'location': {'lat': lat, 'lng': lng},
+            'message': 'No address found or API unavailable',
+            'cached': source != 'api',
+            'timestamp': datetime.now().isoformat()
+        }
+        
+    except Exception as e:
+        logger.error(f"Reverse geocoding error: {str(e)}")
+        raise HTTPException(status_code=500, detail="Reverse geocoding failed")
+
+
 @app.post(
     "/api/distance",
     tags=["Location Services"]
@@ -1301,7 +4054,7 @@ async def calculate_distance(origin: Dict, destination: Dict, mode: str = 'drivi
         result = await get_distance_matrix(origin, destination, mode)
         
         if result:
-            logger.info(f"✅ Distance calculation complete")
+            logger.info("✅ Distance calculation complete")
             return {
                 'status': 'success',
                 'distance_km': result['distance_km'],
@@ -1321,6 +4074,61 @@ async def calculate_distance(origin: Dict, destination: Dict, mode: str = 'drivi
         raise HTTPException(status_code=500, detail="Distance calculation failed")
 
 
+@app.post(
+    "/api/distance-matrix",
+    tags=["Location Services"]
+)
+async def calculate_distance_matrix(request: DistanceMatrixRequest) -> Dict:
+    """
+    Distances and durations from many origins to many destinations
+    
+    Pairs near (~110 m) previously answered ones come from the cache; the
+    rest are fetched in as few Distance Matrix calls as possible, e.g. to
+    rank facilities by travel time in one request.
+    
+    Args:
+        request: Origins, destinations and travel mode
+        
+    Returns:
+        rows[i]['elements'][j]: distance info from origin i to destination j
+        (None where unknown)
+    """
+    if not request.origins or not request.destinations:
+        raise HTTPException(status_code=400, detail="origins and destinations are required")
+    if max(len(request.origins), len(request.destinations)) > DISTANCE_MATRIX_MAX_POINTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {DISTANCE_MATRIX_MAX_POINTS} origins and destinations"
+        )
+    try:
+        for point in request.origins + request.destinations:
+            float(point['lat']), float(point['lng'])
+    except (KeyError, TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Every location needs numeric lat and lng")
+    
+    try:
+        matrix, stats = await get_distance_matrices(
+            request.origins, request.destinations, request.mode
+        )
+        
+        known = any(element for row in matrix for element in row)
+        logger.info(
+            f"✅ Distance matrix {len(request.origins)}x{len(request.destinations)}: "
+            f"{stats['cached_elements']} cached, {stats['api_calls']} API calls"
+        )
+        return {
+            'status': 'success' if known else 'error',
+            'rows': [{'elements': row} for row in matrix],
+            'mode': request.mode,
+            **stats,
+            'timestamp': datetime.now().isoformat()
+        }
+        
+    except Exception as e:
+        logger.error(f"Distance matrix error: {str(e)}")
+        raise HTTPException(status_code=500, detail="Distance matrix calculation failed")
+
+
 @app.get(
     "/api/health",
     tags=["System"]
@@ -1332,11 +4140,18 @@ async def health_check() -> Dict:
     Returns:
         Health status
     """
+    outbox_stats = await asyncio.get_running_loop().run_in_executor(
+        None, get_notification_outbox().stats
+    )
     return {
         'status': 'healthy',
         'service': 'SafeRoute AI Service',
         'timestamp': datetime.now().isoformat(),
-        'version': '1.0.0'
+        'version': '1.0.0',
+        'circuit_breakers': {name: b.snapshot() for name, b in circuit_breakers.items()},
+        'image_workers': image_workers.snapshot(),
+        'notification_outbox': outbox_stats,
+        'location_cache': get_location_cache().stats()
     }
 
 
@@ -0,0 +1,341 @@
+"""
+SafeRoute AI - Local API Stub Server
+====================================
+
+Deterministic local stand-in for the external APIs used by ai_service.py
+and app.py, for load testing and benchmarking without keys or network:
+
+- Groq chat completions (POST /openai/v1/chat/completions, incl. streaming)
+- Google Maps Geocoding (GET /maps/api/geocode/json)
+- Google Maps Distance Matrix (GET /maps/api/distancematrix/json)
+- Google Vision annotate (POST /v1/images:annotate)
+
+Responses are derived from a hash of the input, so the same request
+always gets the same answer. Latency follows a log-normal distribution
+and errors are injected at a configurable rate, both from a seeded RNG.
+
+Configuration (environment, per API: GROQ, MAPS, VISION):
+    STUB_SEED                   RNG seed (default 42)
+    STUB_<API>_LATENCY_MS       Median latency (default STUB_LATENCY_MS or 200)
+    STUB_<API>_LATENCY_SIGMA    Log-normal sigma (default STUB_LATENCY_SIGMA or 0.5)
+    STUB_<API>_ERROR_RATE       Fraction of failed calls (default STUB_ERROR_RATE or 0)
+    STUB_GROQ_TOKEN_MS          Delay between streamed chunks (default 15)
+
+Usage:
+    python stub_server.py                      # listens on :8090
+    API_STUB_URL=http://localhost:8090 uvicorn ai_service:app
+"""
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from typing import Dict, List, Tuple
+import os
+import re
+import json
+import time
+import math
+import random
+import asyncio
+import hashlib
+
+app = FastAPI(
+    title="SafeRoute API Stub",
+    description="Deterministic local stand-in for Groq, Google Maps and Vision",
+    version="1.0.0"
+)
+
+# ==============================================================================
+# CONFIGURATION
+# ==============================================================================
+
+rng = random.Random(int(os.getenv("STUB_SEED", "42")))
+
+
+def _setting(api: str, name: str, default: float) -> float:
+    return float(os.getenv(f"STUB_{api}_{name}", os.getenv(f"STUB_{name}", default)))
+
+
+PROFILES = {
+    api: {
+        'latency_ms': _setting(api, "LATENCY_MS", 200),
+        'sigma': _setting(api, "LATENCY_SIGMA", 0.5),
+        'error_rate': _setting(api, "ERROR_RATE", 0.0),
+    }
+    for api in ("GROQ", "MAPS", "VISION")
+}
+GROQ_TOKEN_MS = float(os.getenv("STUB_GROQ_TOKEN_MS", "15"))
+
+stats = {api: {'calls': 0, 'errors': 0} for api in PROFILES}
+
+
+async def simulate(api: str) -> bool:
+    """
+    Sleep for a sampled latency and decide whether this call fails
+
+    Returns:
+        True if the call should return an error
+    """
+    profile = PROFILES[api]
+    delay = profile['latency_ms'] * math.exp(profile['sigma'] * rng.gauss(0, 1)) / 1000
+    failed = rng.random() < profile['error_rate']
+    stats[api]['calls'] += 1
+    if failed:
+        stats[api]['errors'] += 1
+    await asyncio.sleep(delay)
+    return failed
+
+
+def digest(*parts: str) -> int:
+    """Stable integer hash of the inputs"""
+    return int(hashlib.sha256("|".join(parts).encode()).hexdigest()[:12], 16)
+
+
+# ==============================================================================
+# GROQ CHAT COMPLETIONS
+# ==============================================================================
+
+SEVERITIES = ['LOW', 'MEDIUM', 'HIGH', 'CRITICAL']
+AUTHORITIES = ['POLICE', 'MEDICAL', 'FIRE', 'MUNICIPAL']
+
+
+def fake_analysis(text: str) -> Dict:
+    h = digest(text)
+    return {
+        'severity': SEVERITIES[h % 4],
+        'confidence': round(0.6 + (h % 40) / 100, 2),
+        'key_risks': ['traffic disruption', 'injury risk'][: 1 + h % 2],
+        'suggested_actions': ['Avoid the area', 'Follow official instructions'],
+        'estimated_affected_people': h % 20,
+        'authorities_needed': AUTHORITIES[: 1 + h % 3],
+    }
+
+
+def fake_completion(prompt: str) -> str:
+    """Answer analysis prompts with valid JSON, anything else with text"""
+    batch = re.search(r"JSON array of (\d+) objects", prompt)
+    if batch:
+        items = re.findall(r"^\s*\d+\. (.*)$", prompt, flags=re.M)
+        return json.dumps([fake_analysis(item) for item in items[: int(batch.group(1))]])
+    if '"severity"' in prompt:
+        return json.dumps(fake_analysis(prompt))
+    return (
+        "🎯 **RISK LEVEL:** Medium\n"
+        "✅ **DO'S:** Slow down; keep a safe distance\n"
+        "❌ **DON'Ts:** Do not stop on the road; do not use your phone\n"
+        "🚨 **CALL AUTHORITIES:** Yes - if anyone is hurt"
+    )
+
+
+@app.post("/openai/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    if await simulate("GROQ"):
+        return JSONResponse(
+            status_code=503,
+            content={'error': {'message': 'Stub: service unavailable', 'type': 'server_error'}}
+        )
+
+    prompt = "\n".join(m.get('content', '') for m in body.get('messages', []))
+    content = fake_completion(prompt)
+    created = int(time.time())
+    completion_id = f"chatcmpl-stub-{digest(prompt):x}"
+    model = body.get('model', 'stub')
+
+    if body.get('stream'):
+        async def events():
+            for piece in re.findall(r"\S+\s*", content):
+                chunk = {
+                    'id': completion_id, 'object': 'chat.completion.chunk',
+                    'created': created, 'model': model,
+                    'choices': [{'index': 0, 'delta': {'content': piece}, 'finish_reason': None}]
+                }
+                yield f"data: {json.dumps(chunk)}\n\n"
+                await asyncio.sleep(GROQ_TOKEN_MS / 1000)
+            done = {
+                'id': completion_id, 'object': 'chat.completion.chunk',
+                'created': created, 'model': model,
+                'choices': [{'index': 0, 'delta': {}, 'finish_reason': 'stop'}]
+            }
+            yield f"data: {json.dumps(done)}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    prompt_tokens, completion_tokens = len(prompt.split()), len(content.split())
+    return {
+        'id': completion_id,
+        'object': 'chat.completion',
+        'created': created,
+        'model': model,
+        'choices': [{
+            'index': 0,
+            'message': {'role': 'assistant', 'content': content},
+            'finish_reason': 'stop'
+        }],
+        'usage': {
+            'prompt_tokens': prompt_tokens,
+            'completion_tokens': completion_tokens,
+            'total_tokens': prompt_tokens + completion_tokens
+        }
+    }
+
+
+# ==============================================================================
+# GOOGLE MAPS
+# ==============================================================================
+
+def fake_coordinates(place: str) -> Tuple[float, float]:
+    """Coordinates for "lat,lng" strings, else a stable point in India"""
+    match = re.fullmatch(r"\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*", place)
+    if match:
+        return float(match.group(1)), float(match.group(2))
+    h = digest(place.strip().lower())
+    return 8.0 + (h % 2800000) / 100000, 68.0 + (h // 2800000 % 2900000) / 100000
+
+
+def haversine_km(a: Tuple[float, float], b: Tuple[float, float]) -> float:
+    lat1, lng1, lat2, lng2 = map(math.radians, (*a, *b))
+    h = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return 6371 * 2 * math.asin(math.sqrt(h))
+
+
+MODE_SPEED_KMH = {'driving': 30, 'walking': 5, 'bicycling': 15, 'transit': 20}
+
+
+@app.get("/maps/api/geocode/json")
+async def geocode(address: str = "", latlng: str = ""):
+    if await simulate("MAPS"):
+        return {'status': 'UNKNOWN_ERROR', 'results': [], 'error_message': 'Stub: injected error'}
+
+    query = address or latlng
+    if not query.strip():
+        return {'status': 'ZERO_RESULTS', 'results': []}
+
+    lat, lng = fake_coordinates(query)
+    return {
+        'status': 'OK',
+        'results': [{
+            'formatted_address': address.strip().title() or f"Stub Road, {lat:.4f}, {lng:.4f}",
+            'geometry': {'location': {'lat': lat, 'lng': lng}, 'location_type': 'APPROXIMATE'},
+            'place_id': f"stub-{digest(query):x}",
+            'types': ['street_address']
+        }]
+    }
+
+
+@app.get("/maps/api/distancematrix/json")
+async def distance_matrix(origins: str, destinations: str, mode: str = "driving"):
+    if await simulate("MAPS"):
+        return {'status': 'UNKNOWN_ERROR', 'rows': [], 'error_message': 'Stub: injected error'}
+
+    origin_list: List[str] = origins.split("|")
+    destination_list: List[str] = destinations.split("|")
+    speed = MODE_SPEED_KMH.get(mode, 30)
+
+    rows = []
+    for origin in origin_list:
+        elements = []
+        for destination in destination_list:
+            km = haversine_km(fake_coordinates(origin), fake_coordinates(destination)) * 1.3
+            seconds = km / speed * 3600
+            elements.append({
+                'status': 'OK',
+                'distance': {'value': int(km * 1000), 'text': f"{km:.1f} km"},
+                'duration': {'value': int(seconds), 'text': f"{int(seconds // 60)} mins"}
+            })
+        rows.append({'elements': elements})
+
+    return {
+        'status': 'OK',
+        'origin_addresses': origin_list,
+        'destination_addresses': destination_list,
+        'rows': rows
+    }
+
+
+# ==============================================================================
+# GOOGLE VISION
+# ==============================================================================
+
+OBJECTS = ['Car', 'Person', 'Tree', 'Truck', 'Motorcycle', 'Traffic light', 'Building']
+LABELS = ['Road', 'Vehicle', 'Street', 'Asphalt', 'Infrastructure', 'Water', 'Smoke', 'Crowd']
+
+
+# REST clients may send feature types as enum numbers
+FEATURE_NUMBERS = {4: 'LABEL_DETECTION', 5: 'TEXT_DETECTION', 19: 'OBJECT_LOCALIZATION'}
+
+
+def fake_annotation(content: str, features: List[Dict]) -> Dict:
+    h = digest(content)
+    wanted = {FEATURE_NUMBERS.get(f.get('type'), f.get('type')) for f in features}
+    result = {}
+    if 'OBJECT_LOCALIZATION' in wanted:
+        result['localizedObjectAnnotations'] = [
+            {
+                'name': OBJECTS[(h >> i) % len(OBJECTS)],
+                'score': round(0.55 + ((h >> (i + 3)) % 45) / 100, 2),
+                'boundingPoly': {'normalizedVertices': [
+                    {'x': 0.1, 'y': 0.1}, {'x': 0.6, 'y': 0.1},
+                    {'x': 0.6, 'y': 0.7}, {'x': 0.1, 'y': 0.7}
+                ]}
+            }
+            for i in range(1 + h % 4)
+        ]
+    if 'LABEL_DETECTION' in wanted:
+        result['labelAnnotations'] = [
+            {
+                'description': LABELS[(h >> i) % len(LABELS)],
+                'score': round(0.6 + ((h >> (i + 5)) % 40) / 100, 2),
+                'topicality': 0.8
+            }
+            for i in range(2 + h % 4)
+        ]
+    if 'TEXT_DETECTION' in wanted and h % 3 == 0:
+        result['textAnnotations'] = [{'description': 'STOP', 'locale': 'en'}]
+    return result
+
+
+@app.post("/v1/images:annotate")
+async def annotate(request: Request):
+    body = await request.json()
+    if await simulate("VISION"):
+        return JSONResponse(
+            status_code=500,
+            content={'error': {'code': 500, 'message': 'Stub: injected error', 'status': 'INTERNAL'}}
+        )
+
+    return {
+        'responses': [
+            fake_annotation(item.get('image', {}).get('content', ''), item.get('features', []))
+            for item in body.get('requests', [])
+        ]
+    }
+
+
+# ==============================================================================
+# STUB CONTROL
+# ==============================================================================
+
+@app.get("/stub/stats")
+async def get_stats() -> Dict:
+    """Call and error counts per API, plus the active profiles"""
+    return {'stats': stats, 'profiles': PROFILES}
+
+
+@app.post("/stub/reset")
+async def reset_stats() -> Dict:
+    """Zero the call counters"""
+    for counters in stats.values():
+        counters.update(calls=0, errors=0)
+    return {'status': 'reset'}
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(
+        "stub_server:app",
+        host="0.0.0.0",
+        port=int(os.getenv("STUB_PORT", "8090")),
+        log_level="warning"
+    )
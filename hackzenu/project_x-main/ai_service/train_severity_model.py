@@ -0,0 +1,129 @@
+"""
+SafeRoute AI - Severity Model Training
+======================================
+
+Trains the local text classifier used by ai_service.classify_locally():
+a hashing vectorizer + TF-IDF weighting + linear classifier (logistic
+loss, so predictions come with probabilities) for incident severity, and
+a second one for incident type.
+
+Training data is past incidents (JSON list, {"incidents": [...]} or
+JSONL) with at least `description` and `type`. Incidents without a
+`severity` label can be labelled by Groq (--label-with-groq). Labels
+from the rule engine are not used, since the model would only learn to
+copy it.
+
+Usage:
+    python train_severity_model.py incidents.json [more.jsonl ...]
+    python train_severity_model.py incidents.json --label-with-groq
+"""
+
+import argparse
+import asyncio
+import json
+import os
+from datetime import datetime
+from typing import Dict, List
+
+import joblib
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+from sklearn.linear_model import SGDClassifier
+from sklearn.model_selection import train_test_split
+from sklearn.pipeline import make_pipeline
+
+import ai_service
+
+SEVERITIES = {'LOW', 'MEDIUM', 'HIGH', 'CRITICAL'}
+
+
+def load_incidents(paths: List[str]) -> List[Dict]:
+    """Read incidents from JSON or JSONL files"""
+    incidents = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            if path.endswith('.jsonl'):
+                incidents.extend(json.loads(line) for line in f if line.strip())
+                continue
+            data = json.load(f)
+        incidents.extend(data.get('incidents', []) if isinstance(data, dict) else data)
+    return [i for i in incidents if i.get('description') and i.get('type')]
+
+
+async def label_with_groq(incidents: List[Dict]) -> int:
+    """Fill missing severity labels from Groq; returns how many were labelled"""
+    unlabeled = [i for i in incidents if str(i.get('severity', '')).upper() not in SEVERITIES]
+    analyses = await asyncio.gather(*(
+        ai_service.analyze_with_groq_coalesced(i['description'], i['type'])
+        for i in unlabeled
+    ))
+    labelled = 0
+    for incident, analysis in zip(unlabeled, analyses):
+        if analysis and str(analysis.get('severity', '')).upper() in SEVERITIES:
+            incident['severity'] = analysis['severity']
+            labelled += 1
+    return labelled
+
+
+def make_text_classifier():
+    return make_pipeline(
+        HashingVectorizer(ngram_range=(1, 2), n_features=2 ** 18, alternate_sign=False, norm=None),
+        TfidfTransformer(sublinear_tf=True),
+        SGDClassifier(loss='log_loss', alpha=1e-5, max_iter=50, class_weight='balanced', random_state=42)
+    )
+
+
+def fit_and_score(texts: List[str], labels: List[str]):
+    """Fit on a train split, report holdout accuracy, then refit on everything"""
+    accuracy = None
+    if len(set(labels)) > 1 and len(texts) >= 20:
+        train_x, test_x, train_y, test_y = train_test_split(
+            texts, labels, test_size=0.2, random_state=42
+        )
+        model = make_text_classifier().fit(train_x, train_y)
+        accuracy = round(float(model.score(test_x, test_y)), 4)
+    return make_text_classifier().fit(texts, labels), accuracy
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the local severity/type classifier")
+    parser.add_argument('inputs', nargs='+', help="Incident files (.json or .jsonl)")
+    parser.add_argument('--output', default=ai_service.SEVERITY_MODEL_PATH)
+    parser.add_argument('--label-with-groq', action='store_true',
+                        help="Label incidents without a severity using Groq")
+    args = parser.parse_args()
+
+    incidents = load_incidents(args.inputs)
+    if args.label_with_groq:
+        labelled = asyncio.run(label_with_groq(incidents))
+        print(f"🤖 Groq labelled {labelled} incidents")
+
+    labelled = [i for i in incidents if str(i.get('severity', '')).upper() in SEVERITIES]
+    if len(labelled) < 2 or len({i['severity'].upper() for i in labelled}) < 2:
+        raise SystemExit("Need labelled incidents with at least two severity levels")
+
+    severity_model, severity_accuracy = fit_and_score(
+        [ai_service.severity_model_text(i['type'], i['description']) for i in labelled],
+        [i['severity'].upper() for i in labelled]
+    )
+
+    types = [i['type'].strip().lower() for i in incidents]
+    type_model, type_accuracy = (None, None)
+    if len(set(types)) > 1:
+        type_model, type_accuracy = fit_and_score([i['description'] for i in incidents], types)
+
+    artifact = {
+        'version': ai_service.SEVERITY_MODEL_VERSION,
+        'trained_at': datetime.now().isoformat(),
+        'samples': len(labelled),
+        'severity': severity_model,
+        'type': type_model,
+        'metrics': {'severity_accuracy': severity_accuracy, 'type_accuracy': type_accuracy},
+    }
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    joblib.dump(artifact, args.output, compress=3)
+    print(f"✅ Saved {args.output}: {artifact['metrics']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""
+Authority alert log
+===================
+
+Process-wide buffered writer for authority_alerts.log (one JSON object
+per line). Streamlit runs every session in the same process, so alerts
+from all sessions go through one writer: they are buffered in memory and
+appended by a background thread, instead of every alert opening and
+closing the file.
+
+The active log is rotated once it reaches ALERT_LOG_MAX_BYTES or is older
+than ALERT_LOG_MAX_AGE_HOURS. Rotated segments are named after the time
+their first alert was written (authority_alerts.20260119-101500.log.gz)
+and gzipped, so read_alerts() can skip segments outside a time range and
+stream the rest line by line.
+
+Durability: write() returns once the alert is queued. It reaches disk on
+the next flush (within ALERT_LOG_FLUSH_SECONDS, at once for urgent
+alerts), so a hard crash can lose the last few seconds of alerts. A
+failed flush is kept in last_error and makes write() return False until
+a later flush succeeds.
+"""
+
+import atexit
+import glob
+import gzip
+import json
+import os
+import shutil
+import threading
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ALERT_LOG_PATH = os.getenv("ALERT_LOG_PATH", os.path.join(BASE_DIR, 'authority_alerts.log'))
+ALERT_LOG_MAX_BYTES = int(os.getenv("ALERT_LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+ALERT_LOG_MAX_AGE_HOURS = float(os.getenv("ALERT_LOG_MAX_AGE_HOURS", "24"))
+ALERT_LOG_FLUSH_SECONDS = float(os.getenv("ALERT_LOG_FLUSH_SECONDS", "1"))
+
+SEGMENT_TIME_FORMAT = "%Y%m%d-%H%M%S"
+
+
+def _alert_time(line: str) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(json.loads(line)['timestamp'])
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+class AlertLogWriter:
+    """Buffered, rotating JSON-lines writer with a background flush thread"""
+
+    def __init__(
+        self,
+        path: str = ALERT_LOG_PATH,
+        max_bytes: int = ALERT_LOG_MAX_BYTES,
+        max_age_hours: float = ALERT_LOG_MAX_AGE_HOURS,
+        flush_seconds: float = ALERT_LOG_FLUSH_SECONDS
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_hours * 3600
+        self.flush_seconds = flush_seconds
+
+        self._buffer: List[str] = []
+        self._lock = threading.Lock()        # guards _buffer
+        self._io_lock = threading.Lock()     # guards the file and rotation
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._file = None
+        self._segment_start: Optional[datetime] = None
+        self.last_error: Optional[Exception] = None
+
+        self._thread = threading.Thread(target=self._run, name="alert-log-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # --- writing ---
+
+    def write(self, record: Dict, urgent: bool = False) -> bool:
+        """
+        Queue one alert; urgent alerts are flushed right away
+
+        Returns False if the last flush failed. If the writer thread is
+        gone, the alert is flushed synchronously instead.
+        """
+        line = json.dumps(record, ensure_ascii=False) + '\n'
+        with self._lock:
+            self._buffer.append(line)
+        if not self._thread.is_alive():
+            self._flush_logged()
+        elif urgent:
+            self._wakeup.set()
+        return self.last_error is None
+
+    def flush(self) -> None:
+        """Write buffered alerts to disk, rotating first if needed"""
+        with self._lock:
+            lines, self._buffer = self._buffer, []
+        try:
+            with self._io_lock:
+                if self._should_rotate():
+                    self._rotate()
+                if not lines:
+                    if self._file:
+                        self._file.flush()
+                    return
+                if self._file is None:
+                    self._open()
+                if self._segment_start is None:
+                    self._segment_start = _alert_time(lines[0]) or datetime.now()
+                self._file.writelines(lines)
+                self._file.flush()
+        except BaseException:
+            # Keep the alerts (ahead of newer ones) for the next flush
+            with self._lock:
+                self._buffer[:0] = lines
+            raise
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._wakeup.set()
+        self._thread.join(timeout=5)
+        self.flush()
+        with self._io_lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+    def _flush_logged(self) -> None:
+        try:
+            self.flush()
+            self.last_error = None
+        except Exception as e:
+            self.last_error = e
+            print(f"⚠️  Alert log write failed: {e}")
+
+    def _run(self) -> None:
+        while not self._closed:
+            self._wakeup.wait(self.flush_seconds)
+            self._wakeup.clear()
+            self._flush_logged()
+
+    # --- rotation ---
+
+    def _open(self) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._segment_start = None
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self._segment_start = _alert_time(f.readline())
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    def _should_rotate(self) -> bool:
+        if self._file is None:
+            if not os.path.exists(self.path):
+                return False
+            self._open()
+        size = self._file.tell()
+        # Age of the segment's first alert, so it survives restarts
+        age = (datetime.now() - self._segment_start).total_seconds() if self._segment_start else 0
+        return size > 0 and (size >= self.max_bytes or age >= self.max_age_seconds)
+
+    def _segment_path(self, start: datetime) -> str:
+        stem, ext = os.path.splitext(self.path)
+        candidate = f"{stem}.{start.strftime(SEGMENT_TIME_FORMAT)}{ext}.gz"
+        counter = 1
+        while os.path.exists(candidate):
+            candidate = f"{stem}.{start.strftime(SEGMENT_TIME_FORMAT)}-{counter}{ext}.gz"
+            counter += 1
+        return candidate
+
+    def _rotate(self) -> None:
+        self._file.close()
+        self._file = None
+        segment = self._segment_path(self._segment_start or datetime.now())
+        rotated = f"{self.path}.rotating"
+        os.replace(self.path, rotated)
+        with open(rotated, 'rb') as src, gzip.open(f"{segment}.tmp", 'wb') as dst:
+            shutil.copyfileobj(src, dst)
+        os.replace(f"{segment}.tmp", segment)
+        os.remove(rotated)
+
+    # --- reading ---
+
+    def segments(self) -> List[Tuple[datetime, str]]:
+        """Rotated segments as (start time, path), oldest first"""
+        stem, ext = os.path.splitext(self.path)
+        found = []
+        for path in glob.glob(f"{glob.escape(stem)}.*{ext}.gz"):
+            stamp = os.path.basename(path)[len(os.path.basename(stem)) + 1:]
+            counter = stamp[15:].split('.')[0].lstrip('-')
+            try:
+                start = datetime.strptime(stamp[:15], SEGMENT_TIME_FORMAT)
+            except ValueError:
+                continue
+            found.append((start, int(counter) if counter.isdigit() else 0, path))
+        return [(start, path) for start, _, path in sorted(found)]
+
+    def read_alerts(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> Iterator[Dict]:
+        """
+        Stream alerts with start <= timestamp < end, oldest first
+
+        Only segments overlapping the range are opened, and each is read
+        line by line, so memory use does not grow with the log size.
+        """
+        self.flush()
+        files = self.segments()
+        if os.path.exists(self.path):
+            files.append((self._segment_start or datetime.min, self.path))
+
+        for i, (segment_start, path) in enumerate(files):
+            next_start = files[i + 1][0] if i + 1 < len(files) else None
+            if end is not None and segment_start >= end:
+                break
+            if start is not None and next_start is not None and next_start <= start:
+                continue
+
+            opener = gzip.open if path.endswith('.gz') else open
+            with opener(path, 'rt', encoding='utf-8') as f:
+                for line in f:
+                    timestamp = _alert_time(line)
+                    if timestamp is None or (start is not None and timestamp < start):
+                        continue
+                    if end is not None and timestamp >= end:
+                        break
+                    yield json.loads(line)
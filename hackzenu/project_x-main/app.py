@@ -5,16 +5,23 @@ import os
 from dotenv import load_dotenv
 from datetime import datetime, timedelta
 import math
-from typing import Dict, List
+import time
+from typing import Dict, Iterator, List
 import re
 import folium
 from streamlit_folium import st_folium
 from streamlit_geolocation import streamlit_geolocation
+from recycling_advice import lookup_advice, recycling_advice_prompt
+from alert_log import AlertLogWriter
 
 # ============== INITIALIZATION ==============
 
 load_dotenv()
-groq_client = Groq(api_key=os.getenv("GROQ_API_KEY", ""))
+# API_STUB_URL points Groq at the local stub server (ai_service/stub_server.py)
+groq_client = Groq(
+    api_key=os.getenv("GROQ_API_KEY", "") or ("stub" if os.getenv("API_STUB_URL") else ""),
+    base_url=os.getenv("API_STUB_URL") or None,
+)
 
 # ============== PAGE CONFIG ==============
 
@@ -304,8 +311,56 @@ def get_nearby_facilities(user_lat: float, user_lon: float, radius_km: float = 5
 
 # ============== AI FUNCTIONS ==============
 
-def get_ai_risk_analysis(incident_type: str, description: str) -> str:
-    """Get AI-powered risk analysis using Groq"""
+def record_llm_latency(label: str, first_token_s, total_s: float, source: str = "llm"):
+    """Keep recent time-to-first-token / total latency samples for this session"""
+    samples = st.session_state.setdefault('llm_latency', [])
+    samples.append({
+        "label": label,
+        "source": source,
+        "ttft_s": round(first_token_s, 3) if first_token_s is not None else None,
+        "total_s": round(total_s, 3),
+        "timestamp": datetime.now().isoformat(),
+    })
+    del samples[:-50]
+
+def stream_groq_completion(prompt: str, max_tokens: int, temperature: float, label: str, fallback: str) -> Iterator[str]:
+    """Yield Groq completion text as it arrives (for st.write_stream)"""
+    started = time.perf_counter()
+    first_token_s = None
+    try:
+        response = groq_client.chat.completions.create(
+            model="mixtral-8x7b-32768",
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=max_tokens,
+            temperature=temperature,
+            stream=True
+        )
+        for chunk in response:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                if first_token_s is None:
+                    first_token_s = time.perf_counter() - started
+                yield delta
+    except Exception:
+        yield fallback if first_token_s is None else f"\n\n{fallback}"
+    finally:
+        record_llm_latency(label, first_token_s, time.perf_counter() - started)
+
+def immediate_answer(label: str, text: str, stream: bool, source: str):
+    """Answer without calling the LLM (table hit or fallback), recorded so the caption stays current"""
+    record_llm_latency(label, None, 0.0, source)
+    return iter([text]) if stream else text
+
+def show_first_token_latency():
+    """Caption with the time-to-first-token of the last streamed answer"""
+    samples = st.session_state.get('llm_latency') or []
+    if samples and samples[-1].get("source") == "table":
+        st.caption("⚡ Instant answer (precomputed)")
+    elif samples and samples[-1]["ttft_s"] is not None:
+        st.caption(f"⚡ First words in {samples[-1]['ttft_s']:.2f}s (full answer {samples[-1]['total_s']:.2f}s)")
+
+def get_ai_risk_analysis(incident_type: str, description: str, stream: bool = False):
+    """Get AI-powered risk analysis using Groq (a chunk iterator when stream=True)"""
     try:
         incident_name = INCIDENT_TYPES.get(incident_type, {}).get('name', incident_type)
         
@@ -322,6 +377,9 @@ Provide in this EXACT format:
 
 Keep it SHORT and ACTIONABLE. Drivers need quick advice."""
 
+        if stream:
+            return stream_groq_completion(prompt, 350, 0.7, "risk_analysis", "⚠️ AI Analysis: Unable to process")
+
         message = groq_client.chat.completions.create(
             model="mixtral-8x7b-32768",
             messages=[{"role": "user", "content": prompt}],
@@ -331,10 +389,10 @@ Keep it SHORT and ACTIONABLE. Drivers need quick advice."""
         
         return message.choices[0].message.content
     except Exception as e:
-        return f"⚠️ AI Analysis: Unable to process"
+        return immediate_answer("risk_analysis", "⚠️ AI Analysis: Unable to process", stream, "fallback")
 
-def get_emergency_response_suggestion(situation: str, num_people_nearby: int) -> str:
-    """Get emergency response suggestions"""
+def get_emergency_response_suggestion(situation: str, num_people_nearby: int, stream: bool = False):
+    """Get emergency response suggestions (a chunk iterator when stream=True)"""
     try:
         prompt = f"""EMERGENCY RESPONSE NEEDED - Provide IMMEDIATE, NUMBERED steps:
 
@@ -350,6 +408,9 @@ Format as:
 
 KEEP IT BRIEF - Lives depend on clarity!"""
 
+        if stream:
+            return stream_groq_completion(prompt, 400, 0.8, "emergency_response", "⚠️ Emergency guidance unavailable")
+
         message = groq_client.chat.completions.create(
             model="mixtral-8x7b-32768",
             messages=[{"role": "user", "content": prompt}],
@@ -359,23 +420,20 @@ KEEP IT BRIEF - Lives depend on clarity!"""
         
         return message.choices[0].message.content
     except Exception as e:
-        return f"⚠️ Emergency guidance unavailable"
+        return immediate_answer("emergency_response", "⚠️ Emergency guidance unavailable", stream, "fallback")
 
-def get_recycling_advice(item_name: str, category: str) -> str:
-    """Get AI advice on how to recycle an item"""
+def get_recycling_advice(item_name: str, category: str, stream: bool = False):
+    """Get AI advice on how to recycle an item (a chunk iterator when stream=True)"""
+    # Catalog items are answered from the precomputed table
+    advice = lookup_advice(item_name)
+    if advice:
+        return immediate_answer("recycling_advice", advice, stream, "table")
+    
     try:
-        prompt = f"""You are a recycling expert. Provide BRIEF recycling advice for this item:
+        prompt = recycling_advice_prompt(item_name, category)
 
-**ITEM:** {item_name}
-**CATEGORY:** {category}
-
-Provide:
-✅ **HOW TO PREPARE:** (clean, dry, etc.)
-🏭 **WHERE:** (your local recycling center accepts this)
-♻️ **WHY:** (environmental impact in 1-2 sentences)
-⚠️ **IMPORTANT:** (any safety tips)
-
-Keep each section to 1-2 lines maximum."""
+        if stream:
+            return stream_groq_completion(prompt, 300, 0.7, "recycling_advice", "AI advice unavailable")
 
         message = groq_client.chat.completions.create(
             model="mixtral-8x7b-32768",
@@ -386,7 +444,7 @@ Keep each section to 1-2 lines maximum."""
         
         return message.choices[0].message.content
     except Exception as e:
-        return "AI advice unavailable"
+        return immediate_answer("recycling_advice", "AI advice unavailable", stream, "fallback")
 
 def get_environmental_impact(category: str, weight_kg: float) -> str:
     """Calculate environmental impact of recycling"""
@@ -406,6 +464,11 @@ def get_environmental_impact(category: str, weight_kg: float) -> str:
 
 # ============== NOTIFICATION FUNCTIONS ==============
 
+@st.cache_resource
+def get_alert_log() -> AlertLogWriter:
+    """One buffered authority_alerts.log writer shared by all sessions"""
+    return AlertLogWriter()
+
 def send_to_authorities(incident: Dict, is_emergency: bool = False) -> bool:
     """Log incident for authorities"""
     try:
@@ -419,10 +482,8 @@ def send_to_authorities(incident: Dict, is_emergency: bool = False) -> bool:
             "severity": INCIDENT_TYPES.get(incident.get('type', {}), {}).get('severity', 'unknown')
         }
         
-        with open('d:\\hackzenu\\project_x-main\\authority_alerts.log', 'a') as f:
-            f.write(json.dumps(notification) + '\n')
-        
-        return True
+        # Queued for the background writer; False if the log is failing
+        return get_alert_log().write(notification, urgent=is_emergency)
     except:
         return False
 
@@ -694,21 +755,19 @@ def page_recycling_log():
                 impact = get_environmental_impact(category, weight)
                 st.write(impact)
                 
-                # Get AI advice
-                with st.spinner("🤖 Getting AI advice..."):
-                    advice = get_recycling_advice(item_name, category)
-                    st.markdown("### 💡 How to Recycle This Item")
-                    st.markdown(advice)
+                # Get AI advice (streamed as it is generated)
+                st.markdown("### 💡 How to Recycle This Item")
+                st.write_stream(get_recycling_advice(item_name, category, stream=True))
+                show_first_token_latency()
             else:
                 st.error("Please enter item name")
     
     with col2:
         if st.button("🤖 Get AI Advice", key="get_advice_btn"):
             if item_name:
-                with st.spinner("🤖 Analyzing..."):
-                    advice = get_recycling_advice(item_name, category)
-                    st.markdown("### 💡 How to Recycle This Item")
-                    st.markdown(advice)
+                st.markdown("### 💡 How to Recycle This Item")
+                st.write_stream(get_recycling_advice(item_name, category, stream=True))
+                show_first_token_latency()
 
 def page_recycling_facilities():
     """Find recycling facilities with map"""
@@ -997,21 +1056,19 @@ def page_safety_report():
                 st.success("✅ Incident reported!")
                 st.balloons()
                 
-                # Get AI Analysis
-                with st.spinner("🤖 AI analyzing..."):
-                    analysis = get_ai_risk_analysis(incident_type, description)
-                    st.markdown("### 🤖 AI Risk Analysis")
-                    st.markdown(analysis)
+                # Get AI Analysis (streamed as it is generated)
+                st.markdown("### 🤖 AI Risk Analysis")
+                st.write_stream(get_ai_risk_analysis(incident_type, description, stream=True))
+                show_first_token_latency()
             else:
                 st.error("Please describe the incident")
     
     with col2:
         if st.button("🤖 Get Analysis First", key="analyze_first"):
             if description.strip():
-                with st.spinner("🤖 Analyzing..."):
-                    analysis = get_ai_risk_analysis(incident_type, description)
-                    st.markdown("### 🤖 AI Risk Analysis")
-                    st.markdown(analysis)
+                st.markdown("### 🤖 AI Risk Analysis")
+                st.write_stream(get_ai_risk_analysis(incident_type, description, stream=True))
+                show_first_token_latency()
 
 def page_safety_incidents():
     """View all incidents with interactive map"""
@@ -1211,10 +1268,9 @@ def page_emergency_sos():
                 st.success("✅ SOS SENT!")
                 st.balloons()
                 
-                with st.spinner("🤖 Getting response..."):
-                    suggestions = get_emergency_response_suggestion(emergency_details, 5)
-                    st.markdown("### 🚨 RESPONSE GUIDANCE")
-                    st.markdown(suggestions)
+                st.markdown("### 🚨 RESPONSE GUIDANCE")
+                st.write_stream(get_emergency_response_suggestion(emergency_details, 5, stream=True))
+                show_first_token_latency()
             else:
                 st.error("Describe your emergency")
     
@@ -453,6 +453,19 @@ async function sendNearbyAlerts(incidentId, lat, lng, severity, type) {
   }
 }
 
+/**
+ * Map an AI severity onto the Incident enum (MEDIUM if unknown)
+ */
+function toIncidentSeverity(severity) {
+  const severityMap = {
+    low: 'LOW',
+    medium: 'MEDIUM',
+    high: 'HIGH',
+    critical: 'CRITICAL'
+  };
+  return severityMap[String(severity || '').toLowerCase()] || 'MEDIUM';
+}
+
 /**
  * Call AI service for incident analysis
  */
@@ -475,6 +488,50 @@ async function analyzeIncidentWithAI(incident) {
   }
 }
 
+/**
+ * Call AI service for many incidents (backfills, bulk re-scoring).
+ * Sent in chunks of AI_BATCH_SIZE with streaming off, so every chunk
+ * comes back as one JSON body; results keep the input order.
+ * The AI service spends at most its batch budget (AI_BATCH_BUDGET_MS,
+ * same value as BATCH_LATENCY_BUDGET_MS there) on the LLM per chunk and
+ * scores the rest with rules, so the timeout is that budget plus the
+ * rule scoring of one chunk.
+ */
+async function analyzeIncidentsBatchWithAI(incidents, { useLLM = true } = {}) {
+  const chunkSize = parseInt(process.env.AI_BATCH_SIZE, 10) || 500;
+  const budgetMs = parseInt(process.env.AI_BATCH_BUDGET_MS, 10) || 5000;
+  const timeout = budgetMs + 5000 + chunkSize * 10;
+  const results = [];
+
+  for (let start = 0; start < incidents.length; start += chunkSize) {
+    const chunk = incidents.slice(start, start + chunkSize);
+    try {
+      const response = await axios.post(
+        `${process.env.AI_SERVICE_URL || 'http://localhost:8000'}/api/analyze/batch`,
+        {
+          incidents: chunk.map(incident => ({
+            description: incident.description,
+            type: incident.type,
+            has_photos: !!incident.media?.photoUrls?.length
+          })),
+          use_llm: useLLM
+        },
+        { params: { stream: false }, timeout }
+      );
+
+      if (!Array.isArray(response.data.results) || response.data.results.length !== chunk.length) {
+        throw new Error('Unexpected batch response');
+      }
+      results.push(...response.data.results);
+    } catch (error) {
+      console.error('AI batch analysis error:', error.message);
+      results.push(...chunk.map(() => ({ error: 'Analysis failed' })));
+    }
+  }
+
+  return results;
+}
+
 /**
  * Notify authorities based on severity
  */
@@ -711,14 +768,7 @@ app.post('/api/v1/incidents', authMiddleware, async (req, res) => {
     const aiAnalysis = await analyzeIncidentWithAI(incident);
     
     // Update severity based on AI analysis
-    const severityMap = {
-      low: 'LOW',
-      medium: 'MEDIUM',
-      high: 'HIGH',
-      critical: 'CRITICAL'
-    };
-    
-    incident.severity = severityMap[aiAnalysis.severity?.toLowerCase()] || 'MEDIUM';
+    incident.severity = toIncidentSeverity(aiAnalysis.severity);
     incident.aiAnalysis = {
       riskScore: aiAnalysis.riskScore || 50,
       aiSuggestions: aiAnalysis.suggestions || [],
@@ -814,6 +864,65 @@ app.get('/api/v1/incidents', async (req, res) => {
   }
 });
 
+/**
+ * POST /api/v1/incidents/reanalyze
+ * Re-score stored incidents with the AI service in bulk (authority/admin)
+ */
+app.post('/api/v1/incidents/reanalyze', authMiddleware, async (req, res) => {
+  try {
+    const user = await User.findById(req.userId);
+    if (!user || !['authority', 'admin'].includes(user.role)) {
+      return res.status(403).json({ error: 'Not allowed' });
+    }
+
+    const { status = 'OPEN', limit = 1000, useLLM = false } = req.body;
+    const incidents = await Incident.find(status ? { status } : {})
+      .sort({ createdAt: -1 })
+      .limit(Math.min(parseInt(limit, 10) || 1000, 10000));
+
+    const results = await analyzeIncidentsBatchWithAI(incidents, { useLLM });
+
+    const updates = [];
+    incidents.forEach((incident, index) => {
+      const result = results[index];
+      if (!result || result.error) {
+        return;
+      }
+      updates.push({
+        updateOne: {
+          filter: { _id: incident._id },
+          update: {
+            $set: {
+              // bulkWrite skips schema validation, so map onto the enum here
+              severity: toIncidentSeverity(result.severity),
+              'aiAnalysis.riskScore': result.risk_score,
+              'aiAnalysis.aiSuggestions': result.suggestions || [],
+              'aiAnalysis.classification': result.classification || incident.type,
+              'aiAnalysis.confidence': result.confidence,
+              'aiAnalysis.estimatedPeople': result.estimated_people,
+              'aiAnalysis.estimatedDuration': result.estimated_duration,
+              updatedAt: new Date()
+            }
+          }
+        }
+      });
+    });
+
+    if (updates.length) {
+      await Incident.bulkWrite(updates);
+    }
+
+    res.json({
+      message: 'Incidents re-analyzed',
+      count: incidents.length,
+      updated: updates.length
+    });
+  } catch (error) {
+    console.error('Bulk re-analysis error:', error);
+    res.status(500).json({ error: 'Failed to re-analyze incidents' });
+  }
+});
+
 /**
  * GET /api/v1/incidents/:id
  * Get incident details
@@ -0,0 +1,171 @@
+"""
+Precomputed recycling advice
+============================
+
+Lookup table of AI recycling advice for every item in the waste catalog
+(data.json) plus the RECYCLING_CATEGORIES names, so the app only asks the
+LLM about items it has never seen.
+
+Build the table offline (needs GROQ_API_KEY, or API_STUB_URL for a dry run):
+    python recycling_advice.py                 # writes recycling_advice.json
+    python recycling_advice.py --workers 8 --limit 20
+
+The table is loaded lazily on first lookup. It is generated, not
+committed; without it the app logs a warning and asks the LLM every time.
+"""
+
+import argparse
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CATALOG_PATH = os.path.join(BASE_DIR, 'data.json')
+ADVICE_TABLE_PATH = os.path.join(BASE_DIR, 'recycling_advice.json')
+TABLE_VERSION = 1
+
+# Same categories as RECYCLING_CATEGORIES in app.py
+BASE_CATEGORIES = ["plastic", "paper", "metal", "glass", "electronics", "organic"]
+
+_table: Optional[Dict] = None
+
+
+def recycling_advice_prompt(item_name: str, category: str) -> str:
+    """Prompt used both live (app.py) and by the offline builder"""
+    return f"""You are a recycling expert. Provide BRIEF recycling advice for this item:
+
+**ITEM:** {item_name}
+**CATEGORY:** {category}
+
+Provide:
+✅ **HOW TO PREPARE:** (clean, dry, etc.)
+🏭 **WHERE:** (your local recycling center accepts this)
+♻️ **WHY:** (environmental impact in 1-2 sentences)
+⚠️ **IMPORTANT:** (any safety tips)
+
+Keep each section to 1-2 lines maximum."""
+
+
+def normalize_item_name(name: str) -> str:
+    """Lowercase, drop punctuation and plural 's' so user input matches catalog keys"""
+    words = re.findall(r"[a-z0-9]+", name.lower())
+    return " ".join(w[:-1] if len(w) > 3 and w.endswith('s') and not w.endswith('ss') else w for w in words)
+
+
+def item_keys(item_name: str) -> List[str]:
+    """Lookup keys for a catalog item: full name and name without (notes)"""
+    keys = [normalize_item_name(item_name)]
+    short = normalize_item_name(re.sub(r"\(.*?\)", " ", item_name))
+    if short and short not in keys:
+        keys.append(short)
+    return keys
+
+
+def load_advice_table() -> Dict:
+    """Load the precomputed table once per process (empty if not built)"""
+    global _table
+    if _table is None:
+        try:
+            with open(ADVICE_TABLE_PATH, 'r', encoding='utf-8') as f:
+                _table = json.load(f)
+            if _table.get('version') != TABLE_VERSION:
+                print(f"⚠️  {ADVICE_TABLE_PATH} is version {_table.get('version')}, "
+                      f"expected {TABLE_VERSION} - rebuild it with: python recycling_advice.py")
+                _table = {'advice': [], 'index': {}}
+        except FileNotFoundError:
+            print(f"⚠️  No precomputed recycling advice at {ADVICE_TABLE_PATH} - every item "
+                  f"will go to the LLM. Build it with: python recycling_advice.py")
+            _table = {'advice': [], 'index': {}}
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Could not load {ADVICE_TABLE_PATH} ({e}) - rebuild it with: "
+                  f"python recycling_advice.py")
+            _table = {'advice': [], 'index': {}}
+    return _table
+
+
+def lookup_advice(item_name: str) -> Optional[str]:
+    """Precomputed advice for a known item, or None"""
+    table = load_advice_table()
+    idx = table['index'].get(normalize_item_name(item_name))
+    return table['advice'][idx] if idx is not None else None
+
+
+# ============== OFFLINE BUILDER ==============
+
+def catalog_items() -> List[Tuple[str, str]]:
+    """(item, category description) for every catalog item and base category"""
+    with open(CATALOG_PATH, 'r', encoding='utf-8') as f:
+        catalog = json.load(f)
+
+    items = [(category, category) for category in BASE_CATEGORIES]
+    for bin_id, bin_info in catalog.items():
+        category = f"{bin_info.get('name', bin_id)} ({bin_info.get('description', '')}, {bin_id.replace('_', ' ')} bin)"
+        items.extend((item, category) for item in bin_info.get('accepted_items', []))
+    return items
+
+
+def build_table(workers: int = 4, limit: Optional[int] = None) -> Dict:
+    """Ask the LLM once per catalog item and build the compact lookup table"""
+    from dotenv import load_dotenv
+    from groq import Groq
+
+    load_dotenv()
+    client = Groq(
+        api_key=os.getenv("GROQ_API_KEY", "") or ("stub" if os.getenv("API_STUB_URL") else ""),
+        base_url=os.getenv("API_STUB_URL") or None,
+    )
+
+    def advise(entry: Tuple[str, str]) -> Optional[str]:
+        item, category = entry
+        try:
+            message = client.chat.completions.create(
+                model="mixtral-8x7b-32768",
+                messages=[{"role": "user", "content": recycling_advice_prompt(item, category)}],
+                max_tokens=300,
+                temperature=0.3
+            )
+            return message.choices[0].message.content
+        except Exception as e:
+            print(f"⚠️  {item}: {e}")
+            return None
+
+    items = catalog_items()[:limit]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        answers = list(pool.map(advise, items))
+
+    advice: List[str] = []
+    index: Dict[str, int] = {}
+    for (item, _), answer in zip(items, answers):
+        if not answer:
+            continue
+        advice.append(answer)
+        for key in item_keys(item):
+            index.setdefault(key, len(advice) - 1)
+
+    return {
+        'version': TABLE_VERSION,
+        'generated_at': datetime.now().isoformat(),
+        'advice': advice,
+        'index': index,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute recycling advice for the waste catalog")
+    parser.add_argument('--output', default=ADVICE_TABLE_PATH)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--limit', type=int, default=None)
+    args = parser.parse_args()
+
+    table = build_table(workers=args.workers, limit=args.limit)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(table, f, ensure_ascii=False, separators=(',', ':'))
+
+    print(f"✅ {len(table['advice'])} answers, {len(table['index'])} keys -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()